@@ -84,6 +84,58 @@ def mock_psutil_cpu_per_core() -> Generator[Mock, None, None]:
         yield mock
 
 
+@pytest.fixture
+def mock_cpu_psutil(monkeypatch: pytest.MonkeyPatch) -> Mock:
+    """
+    Мок модуля psutil для CPUWidget (widgets.cpu.psutil).
+
+    По умолчанию: 4 ядра, загрузка 50%. Тесты меняют return_value/side_effect
+    нужных методов. Подмена через monkeypatch дешевле контекстного менеджера patch().
+
+    Returns:
+        Mock: Мок psutil, установленный в widgets.cpu
+    """
+    fake = Mock()
+    fake.cpu_count.return_value = 4
+    fake.cpu_percent.return_value = 50.0
+    monkeypatch.setattr('widgets.cpu.psutil', fake)
+    return fake
+
+
+@pytest.fixture
+def mock_disk_psutil(monkeypatch: pytest.MonkeyPatch) -> Mock:
+    """
+    Мок модуля psutil для DiskWidget (widgets.disk.psutil).
+
+    По умолчанию disk_io_counters() возвращает пустой словарь (дисков нет).
+    Тесты задают счётчики через disk_io_counters.return_value.
+
+    Returns:
+        Mock: Мок psutil, установленный в widgets.disk
+    """
+    fake = Mock()
+    fake.disk_io_counters.return_value = {}
+    monkeypatch.setattr('widgets.disk.psutil', fake)
+    return fake
+
+
+@pytest.fixture
+def mock_memory_psutil(monkeypatch: pytest.MonkeyPatch) -> Mock:
+    """
+    Мок модуля psutil для MemoryWidget (widgets.memory.psutil).
+
+    По умолчанию virtual_memory().percent = 50.0. Тесты задают свой результат
+    через virtual_memory.return_value или side_effect.
+
+    Returns:
+        Mock: Мок psutil, установленный в widgets.memory
+    """
+    fake = Mock()
+    fake.virtual_memory.return_value.percent = 50.0
+    monkeypatch.setattr('widgets.memory.psutil', fake)
+    return fake
+
+
 # =============================================================================
 # Mocking Fixtures - requests (GameSense API)
 # =============================================================================
@@ -160,6 +212,28 @@ def fixed_time() -> Generator[datetime, None, None]:
         yield fixed_datetime
 
 
+@pytest.fixture
+def frozen_clock_time(monkeypatch: pytest.MonkeyPatch) -> datetime:
+    """
+    Фиксирует время для ClockWidget: 2025-11-15 12:34:56.
+
+    Подменяет widgets.clock.datetime подклассом datetime с фиксированным now().
+    Дешевле patch() с MagicMock, а остальные методы datetime работают как обычно.
+
+    Returns:
+        datetime: Фиксированная дата/время, которую возвращает datetime.now()
+    """
+    frozen = datetime(2025, 11, 15, 12, 34, 56)
+
+    class _FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz: Any = None) -> datetime:  # type: ignore[override]
+            return frozen
+
+    monkeypatch.setattr('widgets.clock.datetime', _FrozenDatetime)
+    return frozen
+
+
 # =============================================================================
 # Image Fixtures
 # =============================================================================
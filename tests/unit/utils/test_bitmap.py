@@ -14,17 +14,20 @@ Unit tests для utils.bitmap - утилиты для работы с изоб
 """
 
 import pytest
-from PIL import Image
+from PIL import Image, ImageDraw
 from unittest.mock import patch, Mock
 from utils.bitmap import (
     resolve_font_path,
     load_font,
+    get_font,
     image_to_bytes,
     create_blank_image,
     draw_text,
     draw_centered_text,
     draw_aligned_text,
-    draw_progress_bar
+    rasterize_text,
+    draw_progress_bar,
+    graph_x_coords
 )
 
 
@@ -179,6 +182,29 @@ def test_load_font_fallback_on_error() -> None:
         assert mock_default.called or isinstance(result, Mock)
 
 
+def test_get_font_returns_cached_instance() -> None:
+    """
+    Тест что get_font загружает шрифт один раз для пары (font, size).
+
+    Повторные вызовы возвращают тот же объект без обращения к load_font.
+    """
+    get_font.cache_clear()
+    try:
+        with patch('utils.bitmap.load_font') as mock_load:
+            mock_load.side_effect = lambda font, size: Mock()
+
+            first = get_font("arial", 12)
+            second = get_font("arial", 12)
+            other_size = get_font("arial", 14)
+
+            assert first is second
+            assert other_size is not first
+            assert mock_load.call_count == 2
+    finally:
+        # Не оставляем моки в общем кэше шрифтов
+        get_font.cache_clear()
+
+
 # =============================================================================
 # Тесты image_to_bytes
 # =============================================================================
@@ -455,6 +481,45 @@ def test_draw_aligned_text_all_alignments(h_align: str, v_align: str) -> None:
     assert img is not None
 
 
+def test_draw_aligned_text_reuses_cached_mask() -> None:
+    """
+    Тест что повторная отрисовка того же текста не растеризует его заново.
+
+    Проверяет что результат совпадает, а маска берётся из кэша rasterize_text.
+    """
+    first = create_blank_image()
+    second = create_blank_image()
+
+    draw_aligned_text(first, "12:34:56", font_size=12)
+    hits_before = rasterize_text.cache_info().hits
+    draw_aligned_text(second, "12:34:56", font_size=12)
+
+    assert rasterize_text.cache_info().hits == hits_before + 1
+    assert first.tobytes() == second.tobytes()
+    assert first.getbbox() is not None
+
+
+def test_draw_aligned_text_multiline() -> None:
+    """
+    Тест draw_aligned_text с переводами строк.
+
+    Edge case: Все строки должны быть отрисованы, как при ImageDraw.text().
+    """
+    text = "12:34\n15 Nov"
+    image = create_blank_image()
+    draw_aligned_text(image, text, font_size=12, horizontal_align="left", vertical_align="top")
+
+    expected = create_blank_image()
+    ImageDraw.Draw(expected).text((0, 0), text, fill=255, font=get_font(None, 12))
+
+    assert image.tobytes() == expected.tobytes()
+
+    # Маска охватывает обе строки, а не только первую
+    mask, _ = rasterize_text(text, None, 12)
+    single_line_mask, _ = rasterize_text("12:34", None, 12)
+    assert mask.height > single_line_mask.height * 1.5
+
+
 def test_draw_aligned_text_with_padding() -> None:
     """
     Тест draw_aligned_text с отступами.
@@ -553,3 +618,39 @@ def test_draw_progress_bar_negative_percentage() -> None:
 
     # Должно выполниться без ошибок
     assert img is not None
+
+
+# =============================================================================
+# Тесты graph_x_coords
+# =============================================================================
+
+def test_graph_x_coords_full_history() -> None:
+    """
+    Тест graph_x_coords для полной истории.
+
+    Точки равномерно распределены от левого до правого края области.
+    """
+    xs = graph_x_coords(5, 5, content_x=2, content_w=100)
+
+    assert xs == [2, 27, 52, 77, 102]
+
+
+def test_graph_x_coords_partial_history() -> None:
+    """
+    Тест graph_x_coords для неполной истории.
+
+    Последняя точка должна быть у правого края, как при полной истории.
+    """
+    xs = graph_x_coords(2, 5, content_x=2, content_w=100)
+
+    assert xs == [77, 102]
+
+
+def test_graph_x_coords_edge_cases() -> None:
+    """
+    Тест graph_x_coords для пустой истории и истории длины 1.
+
+    Edge case: Пустая история не даёт точек, длина 1 не приводит к делению на ноль.
+    """
+    assert graph_x_coords(0, 5, content_x=0, content_w=100) == []
+    assert graph_x_coords(1, 1, content_x=3, content_w=100) == [3]
@@ -20,7 +20,7 @@ from PIL import Image
 from datetime import datetime
 from unittest.mock import patch, Mock
 
-from widgets.clock import ClockWidget
+from widgets.clock import ClockWidget, _FAST_FORMATTERS
 
 
 # =============================================================================
@@ -102,7 +102,7 @@ def test_clock_init_sets_time_to_none() -> None:
 # Тесты update()
 # =============================================================================
 
-def test_clock_update_sets_current_time() -> None:
+def test_clock_update_sets_current_time(frozen_clock_time: datetime) -> None:
     """
     Тест что update() обновляет текущее время.
 
@@ -110,31 +110,23 @@ def test_clock_update_sets_current_time() -> None:
     - _current_time устанавливается
     - _formatted_time форматируется согласно format_string
     """
-    with patch('widgets.clock.datetime') as mock_datetime:
-        fixed_time = datetime(2025, 11, 15, 12, 34, 56)
-        mock_datetime.now.return_value = fixed_time
+    widget = ClockWidget(format_string="%H:%M:%S")
+    widget.update()
 
-        widget = ClockWidget(format_string="%H:%M:%S")
-        widget.update()
-
-        assert widget._current_time == fixed_time
-        assert widget._formatted_time == "12:34:56"
+    assert widget._current_time == frozen_clock_time
+    assert widget._formatted_time == "12:34:56"
 
 
-def test_clock_update_with_custom_format() -> None:
+def test_clock_update_with_custom_format(frozen_clock_time: datetime) -> None:
     """
     Тест update() с различными форматами времени.
 
     Проверяет что strftime корректно применяется.
     """
-    with patch('widgets.clock.datetime') as mock_datetime:
-        fixed_time = datetime(2025, 11, 15, 12, 34, 56)
-        mock_datetime.now.return_value = fixed_time
-
-        widget = ClockWidget(format_string="%Y-%m-%d %H:%M")
-        widget.update()
+    widget = ClockWidget(format_string="%Y-%m-%d %H:%M")
+    widget.update()
 
-        assert widget._formatted_time == "2025-11-15 12:34"
+    assert widget._formatted_time == "2025-11-15 12:34"
 
 
 @pytest.mark.parametrize("format_str,expected", [
@@ -144,20 +136,16 @@ def test_clock_update_with_custom_format() -> None:
     ("%Y-%m-%d", "2025-11-15"),
     ("%a %d %b %Y", "Sat 15 Nov 2025"),
 ])
-def test_clock_update_various_formats(format_str: str, expected: str) -> None:
+def test_clock_update_various_formats(format_str: str, expected: str, frozen_clock_time: datetime) -> None:
     """
     Тест update() с различными форматами strftime.
 
     Параметризованный тест проверяет множество форматов.
     """
-    with patch('widgets.clock.datetime') as mock_datetime:
-        fixed_time = datetime(2025, 11, 15, 12, 34, 56)
-        mock_datetime.now.return_value = fixed_time
+    widget = ClockWidget(format_string=format_str)
+    widget.update()
 
-        widget = ClockWidget(format_string=format_str)
-        widget.update()
-
-        assert widget._formatted_time == expected
+    assert widget._formatted_time == expected
 
 
 def test_clock_update_handles_error() -> None:
@@ -178,11 +166,112 @@ def test_clock_update_handles_error() -> None:
         assert widget._formatted_time == "ERROR"
 
 
+def test_clock_update_reuses_formatted_time_within_second() -> None:
+    """
+    Тест что повторный update() в пределах той же секунды не вызывает strftime.
+
+    Проверяет кэширование результата по (секунда, формат).
+    """
+    with patch('widgets.clock.datetime') as mock_datetime:
+        mock_time = Mock()
+        mock_time.strftime.return_value = "15.11.2025"
+        mock_datetime.now.return_value = mock_time
+
+        widget = ClockWidget(format_string="%d.%m.%Y")
+        widget.update()
+        widget.update()
+
+        assert widget._formatted_time == "15.11.2025"
+        assert mock_time.strftime.call_count == 1
+
+
+def test_clock_update_reformats_on_new_second() -> None:
+    """
+    Тест что смена секунды или формата приводит к новому форматированию.
+    """
+    with patch('widgets.clock.datetime') as mock_datetime:
+        mock_datetime.now.return_value = datetime(2025, 11, 15, 12, 34, 56, 100)
+
+        widget = ClockWidget(format_string="%H:%M:%S")
+        widget.update()
+
+        # Та же секунда, другие микросекунды - результат не меняется
+        mock_datetime.now.return_value = datetime(2025, 11, 15, 12, 34, 56, 900)
+        widget.update()
+        assert widget._formatted_time == "12:34:56"
+
+        mock_datetime.now.return_value = datetime(2025, 11, 15, 12, 34, 57)
+        widget.update()
+        assert widget._formatted_time == "12:34:57"
+
+        widget.format_string = "%H:%M"
+        widget.update()
+        assert widget._formatted_time == "12:34"
+
+
+@pytest.mark.parametrize("format_str,second_changes_reformat", [
+    ("%d.%m.%Y %H:%M", False),
+    ("%d.%m.%Y %H:%M:%S", True),
+    ("%c", True),
+])
+def test_clock_update_cache_resolution(format_str: str, second_changes_reformat: bool) -> None:
+    """
+    Тест что форматы без секунд не переформатируются при смене секунды.
+
+    Форматы с секундами (или с директивами, которые могут их включать)
+    переформатируются каждую секунду.
+    """
+    with patch('widgets.clock.datetime') as mock_datetime:
+        first = Mock(year=2025, month=11, day=15, hour=12, minute=34, second=56)
+        first.strftime.return_value = "first"
+        second = Mock(year=2025, month=11, day=15, hour=12, minute=34, second=57)
+        second.strftime.return_value = "second"
+
+        widget = ClockWidget(format_string=format_str)
+        mock_datetime.now.return_value = first
+        widget.update()
+        mock_datetime.now.return_value = second
+        widget.update()
+
+        assert second.strftime.called is second_changes_reformat
+        assert widget._formatted_time == ("second" if second_changes_reformat else "first")
+        assert widget._current_time is second
+
+
+@pytest.mark.parametrize("format_str", ["%H:%M", "%H:%M:%S"])
+@pytest.mark.parametrize("moment", [
+    datetime(2025, 11, 15, 0, 0, 0),
+    datetime(2025, 11, 15, 9, 5, 7),
+    datetime(2025, 11, 15, 23, 59, 59),
+])
+def test_clock_fast_formatters_match_strftime(format_str: str, moment: datetime) -> None:
+    """
+    Тест что быстрые форматтеры дают тот же результат, что и strftime.
+    """
+    assert _FAST_FORMATTERS[format_str](moment) == moment.strftime(format_str)
+
+
+def test_clock_update_microseconds_format_not_cached() -> None:
+    """
+    Edge case: формат с %f обновляется при каждом вызове.
+    """
+    with patch('widgets.clock.datetime') as mock_datetime:
+        mock_datetime.now.return_value = datetime(2025, 11, 15, 12, 34, 56, 100)
+
+        widget = ClockWidget(format_string="%S.%f")
+        widget.update()
+        assert widget._formatted_time == "56.000100"
+
+        mock_datetime.now.return_value = datetime(2025, 11, 15, 12, 34, 56, 900)
+        widget.update()
+        assert widget._formatted_time == "56.000900"
+
+
 # =============================================================================
 # Тесты render()
 # =============================================================================
 
-def test_clock_render_returns_image() -> None:
+def test_clock_render_returns_image(frozen_clock_time: datetime) -> None:
     """
     Тест что render() возвращает PIL Image.
 
@@ -190,136 +279,128 @@ def test_clock_render_returns_image() -> None:
     - Возвращается Image.Image
     - Размер соответствует размерам виджета
     """
-    with patch('widgets.clock.datetime') as mock_datetime:
-        fixed_time = datetime(2025, 11, 15, 12, 34, 56)
-        mock_datetime.now.return_value = fixed_time
+    widget = ClockWidget()
+    widget.set_size(128, 40)
 
-        widget = ClockWidget()
-        widget.set_size(128, 40)
+    image = widget.render()
 
-        image = widget.render()
+    assert isinstance(image, Image.Image)
+    assert image.size == (128, 40)
+
+
+def test_clock_render_multiline_format(frozen_clock_time: datetime) -> None:
+    """
+    Тест рендеринга формата с переводом строки.
+
+    Edge case: Вторая строка формата (дата) не должна обрезаться.
+    """
+    single = ClockWidget(format_string="%H:%M")
+    single.set_size(128, 40)
+    multi = ClockWidget(format_string="%H:%M\n%d %b")
+    multi.set_size(128, 40)
+
+    single_bbox = single.render().getbbox()
+    multi_bbox = multi.render().getbbox()
 
-        assert isinstance(image, Image.Image)
-        assert image.size == (128, 40)
+    assert multi.get_current_time_string() == "12:34\n15 Nov"
+    assert single_bbox is not None and multi_bbox is not None
+    # Две строки занимают заметно больше высоты, чем одна
+    assert (multi_bbox[3] - multi_bbox[1]) > (single_bbox[3] - single_bbox[1]) * 1.5
 
 
-def test_clock_render_calls_update_if_needed() -> None:
+def test_clock_render_calls_update_if_needed(frozen_clock_time: datetime) -> None:
     """
     Тест что render() вызывает update() если время не установлено.
 
     Проверяет автоматическое обновление при первом рендере.
     """
-    with patch('widgets.clock.datetime') as mock_datetime:
-        fixed_time = datetime(2025, 11, 15, 12, 34, 56)
-        mock_datetime.now.return_value = fixed_time
-
-        widget = ClockWidget(format_string="%H:%M")
-        # update() не вызван, _formatted_time пустой
+    widget = ClockWidget(format_string="%H:%M")
+    # update() не вызван, _formatted_time пустой
 
-        widget.render()
+    widget.render()
 
-        # render() должен был вызвать update()
-        assert widget._formatted_time == "12:34"
+    # render() должен был вызвать update()
+    assert widget._formatted_time == "12:34"
 
 
-def test_clock_render_with_black_background() -> None:
+def test_clock_render_with_black_background(frozen_clock_time: datetime) -> None:
     """
     Тест рендеринга с чёрным фоном.
 
     Проверяет что background_color применяется.
     """
-    with patch('widgets.clock.datetime') as mock_datetime:
-        fixed_time = datetime(2025, 11, 15, 12, 34, 56)
-        mock_datetime.now.return_value = fixed_time
+    widget = ClockWidget(background_color=0)
+    widget.update()
+    widget.set_size(128, 40)
 
-        widget = ClockWidget(background_color=0)
-        widget.update()
-        widget.set_size(128, 40)
-
-        image = widget.render()
+    image = widget.render()
 
-        # Фон чёрный, текст должен быть белым (контраст)
-        assert image.mode in ['L', 'LA']
+    # Фон чёрный, текст должен быть белым (контраст)
+    assert image.mode in ['L', 'LA']
 
 
-def test_clock_render_with_white_background() -> None:
+def test_clock_render_with_white_background(frozen_clock_time: datetime) -> None:
     """
     Тест рендеринга с белым фоном.
 
     Проверяет автоматический выбор цвета текста (чёрный на белом).
     """
-    with patch('widgets.clock.datetime') as mock_datetime:
-        fixed_time = datetime(2025, 11, 15, 12, 34, 56)
-        mock_datetime.now.return_value = fixed_time
+    widget = ClockWidget(background_color=255)
+    widget.update()
+    widget.set_size(128, 40)
 
-        widget = ClockWidget(background_color=255)
-        widget.update()
-        widget.set_size(128, 40)
-
-        image = widget.render()
+    image = widget.render()
 
-        # Фон белый (>128), текст должен быть чёрным
-        assert image.mode in ['L', 'LA']
+    # Фон белый (>128), текст должен быть чёрным
+    assert image.mode in ['L', 'LA']
 
 
-def test_clock_render_with_border() -> None:
+def test_clock_render_with_border(frozen_clock_time: datetime) -> None:
     """
     Тест рендеринга с рамкой.
 
     Проверяет что border рисуется.
     """
-    with patch('widgets.clock.datetime') as mock_datetime:
-        fixed_time = datetime(2025, 11, 15, 12, 34, 56)
-        mock_datetime.now.return_value = fixed_time
+    widget = ClockWidget(border=True, border_color=255)
+    widget.update()
+    widget.set_size(128, 40)
 
-        widget = ClockWidget(border=True, border_color=255)
-        widget.update()
-        widget.set_size(128, 40)
+    image = widget.render()
 
-        image = widget.render()
-
-        assert isinstance(image, Image.Image)
-        # Проверяем что изображение не пустое
-        assert image.size == (128, 40)
+    assert isinstance(image, Image.Image)
+    # Проверяем что изображение не пустое
+    assert image.size == (128, 40)
 
 
-def test_clock_render_with_alpha_channel() -> None:
+def test_clock_render_with_alpha_channel(frozen_clock_time: datetime) -> None:
     """
     Тест рендеринга с альфа-каналом (прозрачность).
 
     Проверяет что при opacity < 255 создаётся LA mode изображение.
     """
-    with patch('widgets.clock.datetime') as mock_datetime:
-        fixed_time = datetime(2025, 11, 15, 12, 34, 56)
-        mock_datetime.now.return_value = fixed_time
+    widget = ClockWidget(background_opacity=128)
+    widget.update()
+    widget.set_size(128, 40)
 
-        widget = ClockWidget(background_opacity=128)
-        widget.update()
-        widget.set_size(128, 40)
+    image = widget.render()
 
-        image = widget.render()
-
-        assert image.mode == 'LA'  # Grayscale с альфа
+    assert image.mode == 'LA'  # Grayscale с альфа
 
 
-def test_clock_render_different_sizes() -> None:
+def test_clock_render_different_sizes(frozen_clock_time: datetime) -> None:
     """
     Тест рендеринга с различными размерами.
 
     Проверяет что render адаптируется к размеру виджета.
     """
-    with patch('widgets.clock.datetime') as mock_datetime:
-        fixed_time = datetime(2025, 11, 15, 12, 34, 56)
-        mock_datetime.now.return_value = fixed_time
-
-        widget = ClockWidget()
-        widget.update()
+    widget = ClockWidget()
+    widget.update()
 
-        # Разные размеры
-        for width, height in [(64, 20), (128, 40), (256, 80)]:
-            widget.set_size(width, height)
-            image = widget.render()
-            assert image.size == (width, height)
+    # Разные размеры
+    for width, height in [(64, 20), (128, 40), (256, 80)]:
+        widget.set_size(width, height)
+        image = widget.render()
+        assert image.size == (width, height)
 
 
 @pytest.mark.parametrize("h_align,v_align", [
@@ -327,45 +408,37 @@ def test_clock_render_different_sizes() -> None:
     ("center", "center"),
     ("right", "bottom"),
 ])
-def test_clock_render_with_alignment(h_align: str, v_align: str) -> None:
+def test_clock_render_with_alignment(h_align: str, v_align: str, frozen_clock_time: datetime) -> None:
     """
     Тест рендеринга с различным выравниванием.
 
     Параметризованный тест проверяет разные комбинации выравнивания.
     """
-    with patch('widgets.clock.datetime') as mock_datetime:
-        fixed_time = datetime(2025, 11, 15, 12, 34, 56)
-        mock_datetime.now.return_value = fixed_time
+    widget = ClockWidget(
+        horizontal_align=h_align,
+        vertical_align=v_align
+    )
+    widget.update()
+    widget.set_size(128, 40)
 
-        widget = ClockWidget(
-            horizontal_align=h_align,
-            vertical_align=v_align
-        )
-        widget.update()
-        widget.set_size(128, 40)
+    image = widget.render()
 
-        image = widget.render()
+    assert isinstance(image, Image.Image)
 
-        assert isinstance(image, Image.Image)
 
-
-def test_clock_render_with_padding() -> None:
+def test_clock_render_with_padding(frozen_clock_time: datetime) -> None:
     """
     Тест рендеринга с отступами.
 
     Проверяет что padding применяется.
     """
-    with patch('widgets.clock.datetime') as mock_datetime:
-        fixed_time = datetime(2025, 11, 15, 12, 34, 56)
-        mock_datetime.now.return_value = fixed_time
+    widget = ClockWidget(padding=10)
+    widget.update()
+    widget.set_size(128, 40)
 
-        widget = ClockWidget(padding=10)
-        widget.update()
-        widget.set_size(128, 40)
+    image = widget.render()
 
-        image = widget.render()
-
-        assert isinstance(image, Image.Image)
+    assert isinstance(image, Image.Image)
 
 
 # =============================================================================
@@ -396,7 +469,7 @@ def test_get_update_interval_custom() -> None:
 # Тесты set_format()
 # =============================================================================
 
-def test_set_format_changes_format_string() -> None:
+def test_set_format_changes_format_string(frozen_clock_time: datetime) -> None:
     """
     Тест set_format() изменяет формат времени.
 
@@ -405,61 +478,49 @@ def test_set_format_changes_format_string() -> None:
     - update() вызывается автоматически
     - Новый формат применяется
     """
-    with patch('widgets.clock.datetime') as mock_datetime:
-        fixed_time = datetime(2025, 11, 15, 12, 34, 56)
-        mock_datetime.now.return_value = fixed_time
-
-        widget = ClockWidget(format_string="%H:%M:%S")
-        widget.update()
-        assert widget._formatted_time == "12:34:56"
+    widget = ClockWidget(format_string="%H:%M:%S")
+    widget.update()
+    assert widget._formatted_time == "12:34:56"
 
-        # Меняем формат
-        widget.set_format("%H:%M")
+    # Меняем формат
+    widget.set_format("%H:%M")
 
-        assert widget.format_string == "%H:%M"
-        assert widget._formatted_time == "12:34"
+    assert widget.format_string == "%H:%M"
+    assert widget._formatted_time == "12:34"
 
 
-def test_set_format_multiple_times() -> None:
+def test_set_format_multiple_times(frozen_clock_time: datetime) -> None:
     """
     Тест множественных вызовов set_format().
 
     Проверяет что формат можно менять многократно.
     """
-    with patch('widgets.clock.datetime') as mock_datetime:
-        fixed_time = datetime(2025, 11, 15, 12, 34, 56)
-        mock_datetime.now.return_value = fixed_time
+    widget = ClockWidget()
 
-        widget = ClockWidget()
+    widget.set_format("%H:%M")
+    assert widget._formatted_time == "12:34"
 
-        widget.set_format("%H:%M")
-        assert widget._formatted_time == "12:34"
+    widget.set_format("%d.%m.%Y")
+    assert widget._formatted_time == "15.11.2025"
 
-        widget.set_format("%d.%m.%Y")
-        assert widget._formatted_time == "15.11.2025"
-
-        widget.set_format("%Y-%m-%d %H:%M:%S")
-        assert widget._formatted_time == "2025-11-15 12:34:56"
+    widget.set_format("%Y-%m-%d %H:%M:%S")
+    assert widget._formatted_time == "2025-11-15 12:34:56"
 
 
 # =============================================================================
 # Тесты get_current_time_string()
 # =============================================================================
 
-def test_get_current_time_string_after_update() -> None:
+def test_get_current_time_string_after_update(frozen_clock_time: datetime) -> None:
     """
     Тест get_current_time_string() возвращает отформатированное время.
 
     Проверяет что метод возвращает _formatted_time.
     """
-    with patch('widgets.clock.datetime') as mock_datetime:
-        fixed_time = datetime(2025, 11, 15, 12, 34, 56)
-        mock_datetime.now.return_value = fixed_time
-
-        widget = ClockWidget(format_string="%H:%M")
-        widget.update()
+    widget = ClockWidget(format_string="%H:%M")
+    widget.update()
 
-        assert widget.get_current_time_string() == "12:34"
+    assert widget.get_current_time_string() == "12:34"
 
 
 def test_get_current_time_string_before_update() -> None:
@@ -494,36 +555,32 @@ def test_get_current_time_string_after_error() -> None:
 # Edge cases и интеграционные тесты
 # =============================================================================
 
-def test_clock_full_workflow() -> None:
+def test_clock_full_workflow(frozen_clock_time: datetime) -> None:
     """
     Тест полного workflow Clock widget.
 
     Интеграционный тест: init -> update -> render -> get_current_time_string.
     """
-    with patch('widgets.clock.datetime') as mock_datetime:
-        fixed_time = datetime(2025, 11, 15, 12, 34, 56)
-        mock_datetime.now.return_value = fixed_time
-
-        widget = ClockWidget(
-            name="TestClock",
-            format_string="%H:%M",
-            font_size=14,
-            border=True,
-            horizontal_align="left"
-        )
-        widget.set_size(128, 40)
-
-        # Update
-        widget.update()
-        assert widget.get_current_time_string() == "12:34"
+    widget = ClockWidget(
+        name="TestClock",
+        format_string="%H:%M",
+        font_size=14,
+        border=True,
+        horizontal_align="left"
+    )
+    widget.set_size(128, 40)
 
-        # Render
-        image = widget.render()
-        assert image.size == (128, 40)
+    # Update
+    widget.update()
+    assert widget.get_current_time_string() == "12:34"
+
+    # Render
+    image = widget.render()
+    assert image.size == (128, 40)
 
-        # Change format
-        widget.set_format("%d.%m.%Y")
-        assert widget.get_current_time_string() == "15.11.2025"
+    # Change format
+    widget.set_format("%d.%m.%Y")
+    assert widget.get_current_time_string() == "15.11.2025"
 
 
 def test_clock_midnight_time() -> None:
@@ -15,7 +15,7 @@ Unit tests для widgets.cpu - виджет мониторинга CPU.
 
 import pytest
 from PIL import Image
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from widgets.cpu import CPUWidget
 
@@ -37,7 +37,7 @@ def test_cpu_init_requires_psutil() -> None:
         assert "psutil library is required" in str(exc_info.value)
 
 
-def test_cpu_init_default_values() -> None:
+def test_cpu_init_default_values(mock_cpu_psutil: Mock) -> None:
     """
     Тест инициализации CPU widget с дефолтными параметрами.
 
@@ -47,19 +47,16 @@ def test_cpu_init_default_values() -> None:
     - Дефолтный интервал обновления 1.0 секунда
     - Дефолтная длина истории 30
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
-
-        widget = CPUWidget()
+    widget = CPUWidget()
 
-        assert widget.name == "CPU"
-        assert widget.display_mode == "bar_horizontal"
-        assert widget.per_core is False
-        assert widget.update_interval_sec == 1.0
-        assert widget.history_length == 30
-        assert widget._core_count == 4
-        assert widget._current_usage is None
-        assert len(widget._usage_history) == 0
+    assert widget.name == "CPU"
+    assert widget.display_mode == "bar_horizontal"
+    assert widget.per_core is False
+    assert widget.update_interval_sec == 1.0
+    assert widget.history_length == 30
+    assert widget._core_count == 4
+    assert widget._current_usage is None
+    assert len(widget._usage_history) == 0
 
 
 def test_cpu_init_custom_values() -> None:
@@ -109,25 +106,22 @@ def test_cpu_init_gets_core_count() -> None:
 
 
 @pytest.mark.parametrize("mode", ["text", "bar_horizontal", "bar_vertical", "graph"])
-def test_cpu_init_all_display_modes(mode: str) -> None:
+def test_cpu_init_all_display_modes(mode: str, mock_cpu_psutil: Mock) -> None:
     """
     Тест инициализации со всеми режимами отображения.
 
     Параметризованный тест проверяет все 4 режима.
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
+    widget = CPUWidget(display_mode=mode)
 
-        widget = CPUWidget(display_mode=mode)
-
-        assert widget.display_mode == mode
+    assert widget.display_mode == mode
 
 
 # =============================================================================
 # Тесты update() - aggregate mode
 # =============================================================================
 
-def test_cpu_update_aggregate_mode() -> None:
+def test_cpu_update_aggregate_mode(mock_cpu_psutil: Mock) -> None:
     """
     Тест update() в aggregate режиме.
 
@@ -136,87 +130,77 @@ def test_cpu_update_aggregate_mode() -> None:
     - Сохранение в _current_usage как float
     - Значение в диапазоне 0-100
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
-        mock_psutil.cpu_percent.return_value = 45.5
+    mock_cpu_psutil.cpu_percent.return_value = 45.5
 
-        widget = CPUWidget(per_core=False)
-        widget.update()
+    widget = CPUWidget(per_core=False)
+    widget.update()
 
-        mock_psutil.cpu_percent.assert_called_with(interval=0.1)
-        assert widget._current_usage == 45.5
-        assert isinstance(widget._current_usage, float)
+    mock_cpu_psutil.cpu_percent.assert_called_with(interval=0.1)
+    assert widget._current_usage == 45.5
+    assert isinstance(widget._current_usage, float)
 
 
-def test_cpu_update_aggregate_clamps_high_values() -> None:
+def test_cpu_update_aggregate_clamps_high_values(mock_cpu_psutil: Mock) -> None:
     """
     Тест что update() ограничивает значения > 100%.
 
     Edge case: psutil иногда может вернуть >100%.
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
-        mock_psutil.cpu_percent.return_value = 150.0
+    mock_cpu_psutil.cpu_percent.return_value = 150.0
 
-        widget = CPUWidget(per_core=False)
-        widget.update()
+    widget = CPUWidget(per_core=False)
+    widget.update()
 
-        assert widget._current_usage == 100.0
+    assert widget._current_usage == 100.0
 
 
-def test_cpu_update_aggregate_clamps_negative_values() -> None:
+def test_cpu_update_aggregate_clamps_negative_values(mock_cpu_psutil: Mock) -> None:
     """
     Тест что update() ограничивает отрицательные значения.
 
     Edge case: Защита от некорректных данных.
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
-        mock_psutil.cpu_percent.return_value = -5.0
+    mock_cpu_psutil.cpu_percent.return_value = -5.0
 
-        widget = CPUWidget(per_core=False)
-        widget.update()
+    widget = CPUWidget(per_core=False)
+    widget.update()
 
-        assert widget._current_usage == 0.0
+    assert widget._current_usage == 0.0
 
 
-def test_cpu_update_aggregate_zero_percent() -> None:
+def test_cpu_update_aggregate_zero_percent(mock_cpu_psutil: Mock) -> None:
     """
     Тест update() с 0% загрузкой.
 
     Edge case: Полностью незагруженный CPU.
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
-        mock_psutil.cpu_percent.return_value = 0.0
+    mock_cpu_psutil.cpu_percent.return_value = 0.0
 
-        widget = CPUWidget(per_core=False)
-        widget.update()
+    widget = CPUWidget(per_core=False)
+    widget.update()
 
-        assert widget._current_usage == 0.0
+    assert widget._current_usage == 0.0
 
 
-def test_cpu_update_aggregate_100_percent() -> None:
+def test_cpu_update_aggregate_100_percent(mock_cpu_psutil: Mock) -> None:
     """
     Тест update() с 100% загрузкой.
 
     Edge case: Полностью загруженный CPU.
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
-        mock_psutil.cpu_percent.return_value = 100.0
+    mock_cpu_psutil.cpu_percent.return_value = 100.0
 
-        widget = CPUWidget(per_core=False)
-        widget.update()
+    widget = CPUWidget(per_core=False)
+    widget.update()
 
-        assert widget._current_usage == 100.0
+    assert widget._current_usage == 100.0
 
 
 # =============================================================================
 # Тесты update() - per-core mode
 # =============================================================================
 
-def test_cpu_update_per_core_mode() -> None:
+def test_cpu_update_per_core_mode(mock_cpu_psutil: Mock) -> None:
     """
     Тест update() в per-core режиме.
 
@@ -225,33 +209,29 @@ def test_cpu_update_per_core_mode() -> None:
     - Сохранение в _current_usage как list
     - Все значения в диапазоне 0-100
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
-        mock_psutil.cpu_percent.return_value = [25.0, 50.0, 75.0, 100.0]
+    mock_cpu_psutil.cpu_percent.return_value = [25.0, 50.0, 75.0, 100.0]
 
-        widget = CPUWidget(per_core=True)
-        widget.update()
+    widget = CPUWidget(per_core=True)
+    widget.update()
 
-        mock_psutil.cpu_percent.assert_called_with(interval=0.1, percpu=True)
-        assert widget._current_usage == [25.0, 50.0, 75.0, 100.0]
-        assert isinstance(widget._current_usage, list)
-        assert len(widget._current_usage) == 4
+    mock_cpu_psutil.cpu_percent.assert_called_with(interval=0.1, percpu=True)
+    assert widget._current_usage == [25.0, 50.0, 75.0, 100.0]
+    assert isinstance(widget._current_usage, list)
+    assert len(widget._current_usage) == 4
 
 
-def test_cpu_update_per_core_clamps_values() -> None:
+def test_cpu_update_per_core_clamps_values(mock_cpu_psutil: Mock) -> None:
     """
     Тест что update() ограничивает значения per-core.
 
     Edge case: Каждое ядро может иметь >100% или <0%.
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
-        mock_psutil.cpu_percent.return_value = [-5.0, 50.0, 150.0, 100.0]
+    mock_cpu_psutil.cpu_percent.return_value = [-5.0, 50.0, 150.0, 100.0]
 
-        widget = CPUWidget(per_core=True)
-        widget.update()
+    widget = CPUWidget(per_core=True)
+    widget.update()
 
-        assert widget._current_usage == [0.0, 50.0, 100.0, 100.0]
+    assert widget._current_usage == [0.0, 50.0, 100.0, 100.0]
 
 
 def test_cpu_update_per_core_different_core_counts() -> None:
@@ -277,105 +257,94 @@ def test_cpu_update_per_core_different_core_counts() -> None:
 # Тесты update() - graph mode history
 # =============================================================================
 
-def test_cpu_update_graph_mode_adds_to_history() -> None:
+def test_cpu_update_graph_mode_adds_to_history(mock_cpu_psutil: Mock) -> None:
     """
     Тест что update() добавляет значения в историю в graph режиме.
 
     Проверяет _usage_history deque.
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
-        mock_psutil.cpu_percent.return_value = 50.0
+    mock_cpu_psutil.cpu_percent.return_value = 50.0
 
-        widget = CPUWidget(display_mode="graph", history_length=5)
+    widget = CPUWidget(display_mode="graph", history_length=5)
 
-        # Добавляем несколько образцов
-        for i in range(3):
-            mock_psutil.cpu_percent.return_value = float(i * 20)
-            widget.update()
+    # Добавляем несколько образцов
+    for i in range(3):
+        mock_cpu_psutil.cpu_percent.return_value = float(i * 20)
+        widget.update()
 
-        assert len(widget._usage_history) == 3
-        assert list(widget._usage_history) == [0.0, 20.0, 40.0]
+    assert len(widget._usage_history) == 3
+    assert list(widget._usage_history) == [0.0, 20.0, 40.0]
 
 
-def test_cpu_update_graph_mode_respects_max_length() -> None:
+def test_cpu_update_graph_mode_respects_max_length(mock_cpu_psutil: Mock) -> None:
     """
     Тест что история ограничена maxlen.
 
     Edge case: Старые значения вытесняются новыми.
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
+    widget = CPUWidget(display_mode="graph", history_length=3)
 
-        widget = CPUWidget(display_mode="graph", history_length=3)
-
-        # Добавляем больше образцов чем maxlen
-        for i in range(5):
-            mock_psutil.cpu_percent.return_value = float(i * 10)
-            widget.update()
+    # Добавляем больше образцов чем maxlen
+    for i in range(5):
+        mock_cpu_psutil.cpu_percent.return_value = float(i * 10)
+        widget.update()
 
-        # Должны остаться только последние 3
-        assert len(widget._usage_history) == 3
-        assert list(widget._usage_history) == [20.0, 30.0, 40.0]
+    # Должны остаться только последние 3
+    assert len(widget._usage_history) == 3
+    assert list(widget._usage_history) == [20.0, 30.0, 40.0]
 
 
-def test_cpu_update_non_graph_mode_no_history() -> None:
+def test_cpu_update_non_graph_mode_no_history(mock_cpu_psutil: Mock) -> None:
     """
     Тест что в non-graph режимах история не добавляется.
 
     Проверяет что history пустая для других режимов.
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
-        mock_psutil.cpu_percent.return_value = 50.0
+    mock_cpu_psutil.cpu_percent.return_value = 50.0
 
-        widget = CPUWidget(display_mode="text")
-        widget.update()
+    widget = CPUWidget(display_mode="text")
+    widget.update()
 
-        assert len(widget._usage_history) == 0
+    assert len(widget._usage_history) == 0
 
 
 # =============================================================================
 # Тесты update() - error handling
 # =============================================================================
 
-def test_cpu_update_handles_psutil_error_aggregate() -> None:
+def test_cpu_update_handles_psutil_error_aggregate(mock_cpu_psutil: Mock) -> None:
     """
     Тест обработки ошибки psutil в aggregate режиме.
 
     Edge case: psutil.cpu_percent() падает, должен вернуть 0.0.
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
-        mock_psutil.cpu_percent.side_effect = Exception("psutil error")
+    mock_cpu_psutil.cpu_percent.side_effect = Exception("psutil error")
 
-        widget = CPUWidget(per_core=False)
-        widget.update()
+    widget = CPUWidget(per_core=False)
+    widget.update()
 
-        assert widget._current_usage == 0.0
+    assert widget._current_usage == 0.0
 
 
-def test_cpu_update_handles_psutil_error_per_core() -> None:
+def test_cpu_update_handles_psutil_error_per_core(mock_cpu_psutil: Mock) -> None:
     """
     Тест обработки ошибки psutil в per-core режиме.
 
     Edge case: psutil.cpu_percent() падает, должен вернуть список нулей.
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
-        mock_psutil.cpu_percent.side_effect = Exception("psutil error")
+    mock_cpu_psutil.cpu_percent.side_effect = Exception("psutil error")
 
-        widget = CPUWidget(per_core=True)
-        widget.update()
+    widget = CPUWidget(per_core=True)
+    widget.update()
 
-        assert widget._current_usage == [0.0, 0.0, 0.0, 0.0]
+    assert widget._current_usage == [0.0, 0.0, 0.0, 0.0]
 
 
 # =============================================================================
 # Тесты render()
 # =============================================================================
 
-def test_cpu_render_returns_image() -> None:
+def test_cpu_render_returns_image(mock_cpu_psutil: Mock) -> None:
     """
     Тест что render() возвращает PIL Image.
 
@@ -383,414 +352,371 @@ def test_cpu_render_returns_image() -> None:
     - Возвращается Image.Image
     - Размер соответствует размерам виджета
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
-        mock_psutil.cpu_percent.return_value = 50.0
+    mock_cpu_psutil.cpu_percent.return_value = 50.0
 
-        widget = CPUWidget()
-        widget.set_size(128, 40)
-        widget.update()
+    widget = CPUWidget()
+    widget.set_size(128, 40)
+    widget.update()
 
-        image = widget.render()
+    image = widget.render()
 
-        assert isinstance(image, Image.Image)
-        assert image.size == (128, 40)
+    assert isinstance(image, Image.Image)
+    assert image.size == (128, 40)
 
 
-def test_cpu_render_calls_update_if_needed() -> None:
+def test_cpu_render_calls_update_if_needed(mock_cpu_psutil: Mock) -> None:
     """
     Тест что render() вызывает update() если данные не установлены.
 
     Проверяет автоматическое обновление при первом рендере.
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
-        mock_psutil.cpu_percent.return_value = 75.0
+    mock_cpu_psutil.cpu_percent.return_value = 75.0
 
-        widget = CPUWidget()
-        widget.set_size(128, 40)
-        # update() не вызван, _current_usage = None
+    widget = CPUWidget()
+    widget.set_size(128, 40)
+    # update() не вызван, _current_usage = None
 
-        widget.render()
+    widget.render()
 
-        # render() должен был вызвать update()
-        assert widget._current_usage == 75.0
+    # render() должен был вызвать update()
+    assert widget._current_usage == 75.0
 
 
-def test_cpu_render_with_border() -> None:
+def test_cpu_render_with_border(mock_cpu_psutil: Mock) -> None:
     """
     Тест рендеринга с рамкой.
 
     Проверяет что border рисуется.
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
-        mock_psutil.cpu_percent.return_value = 50.0
+    mock_cpu_psutil.cpu_percent.return_value = 50.0
 
-        widget = CPUWidget(border=True, border_color=255)
-        widget.set_size(128, 40)
-        widget.update()
+    widget = CPUWidget(border=True, border_color=255)
+    widget.set_size(128, 40)
+    widget.update()
 
-        image = widget.render()
+    image = widget.render()
 
-        assert isinstance(image, Image.Image)
+    assert isinstance(image, Image.Image)
 
 
-def test_cpu_render_with_alpha_channel() -> None:
+def test_cpu_render_with_alpha_channel(mock_cpu_psutil: Mock) -> None:
     """
     Тест рендеринга с альфа-каналом (прозрачность).
 
     Проверяет что при opacity < 255 создаётся LA mode изображение.
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
-        mock_psutil.cpu_percent.return_value = 50.0
+    mock_cpu_psutil.cpu_percent.return_value = 50.0
 
-        widget = CPUWidget(background_opacity=128)
-        widget.set_size(128, 40)
-        widget.update()
+    widget = CPUWidget(background_opacity=128)
+    widget.set_size(128, 40)
+    widget.update()
 
-        image = widget.render()
+    image = widget.render()
 
-        assert image.mode == 'LA'
+    assert image.mode == 'LA'
 
 
 # =============================================================================
 # Тесты _render_text()
 # =============================================================================
 
-def test_cpu_render_text_aggregate() -> None:
+def test_cpu_render_text_aggregate(mock_cpu_psutil: Mock) -> None:
     """
     Тест рендеринга в text режиме (aggregate).
 
     Проверяет что отображается одно число.
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
-        mock_psutil.cpu_percent.return_value = 67.3
+    mock_cpu_psutil.cpu_percent.return_value = 67.3
 
-        widget = CPUWidget(display_mode="text", per_core=False)
-        widget.set_size(128, 40)
-        widget.update()
+    widget = CPUWidget(display_mode="text", per_core=False)
+    widget.set_size(128, 40)
+    widget.update()
 
-        image = widget.render()
+    image = widget.render()
 
-        assert isinstance(image, Image.Image)
-        # Текст "67" должен быть отрендерен (без десятичных)
+    assert isinstance(image, Image.Image)
+    # Текст "67" должен быть отрендерен (без десятичных)
 
 
-def test_cpu_render_text_per_core() -> None:
+def test_cpu_render_text_per_core(mock_cpu_psutil: Mock) -> None:
     """
     Тест рендеринга в text режиме (per-core).
 
     Проверяет что отображается сетка чисел для каждого ядра.
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
-        mock_psutil.cpu_percent.return_value = [25.0, 50.0, 75.0, 100.0]
+    mock_cpu_psutil.cpu_percent.return_value = [25.0, 50.0, 75.0, 100.0]
 
-        widget = CPUWidget(display_mode="text", per_core=True)
-        widget.set_size(128, 40)
-        widget.update()
+    widget = CPUWidget(display_mode="text", per_core=True)
+    widget.set_size(128, 40)
+    widget.update()
 
-        image = widget.render()
+    image = widget.render()
 
-        assert isinstance(image, Image.Image)
+    assert isinstance(image, Image.Image)
 
 
 # =============================================================================
 # Тесты _render_bar_horizontal()
 # =============================================================================
 
-def test_cpu_render_bar_horizontal_aggregate() -> None:
+def test_cpu_render_bar_horizontal_aggregate(mock_cpu_psutil: Mock) -> None:
     """
     Тест рендеринга горизонтального бара (aggregate).
 
     Проверяет что рисуется один горизонтальный бар.
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
-        mock_psutil.cpu_percent.return_value = 50.0
+    mock_cpu_psutil.cpu_percent.return_value = 50.0
 
-        widget = CPUWidget(display_mode="bar_horizontal", per_core=False)
-        widget.set_size(128, 40)
-        widget.update()
+    widget = CPUWidget(display_mode="bar_horizontal", per_core=False)
+    widget.set_size(128, 40)
+    widget.update()
 
-        image = widget.render()
+    image = widget.render()
 
-        assert isinstance(image, Image.Image)
-        # Проверяем что есть белые пиксели (бар отрисован)
-        pixels = list(image.getdata())
-        assert any(p == 255 for p in pixels) or any(p == (255, 255) for p in pixels)
+    assert isinstance(image, Image.Image)
+    # Проверяем что есть белые пиксели (бар отрисован): максимум яркости 255.
+    # getextrema() считается в C, без материализации пикселей в список
+    assert image.getchannel('L').getextrema()[1] == 255
 
 
-def test_cpu_render_bar_horizontal_per_core() -> None:
+def test_cpu_render_bar_horizontal_per_core(mock_cpu_psutil: Mock) -> None:
     """
     Тест рендеринга горизонтальных баров (per-core).
 
     Проверяет что рисуется по бару на каждое ядро.
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
-        mock_psutil.cpu_percent.return_value = [25.0, 50.0, 75.0, 100.0]
+    mock_cpu_psutil.cpu_percent.return_value = [25.0, 50.0, 75.0, 100.0]
 
-        widget = CPUWidget(display_mode="bar_horizontal", per_core=True)
-        widget.set_size(128, 40)
-        widget.update()
+    widget = CPUWidget(display_mode="bar_horizontal", per_core=True)
+    widget.set_size(128, 40)
+    widget.update()
 
-        image = widget.render()
+    image = widget.render()
 
-        assert isinstance(image, Image.Image)
+    assert isinstance(image, Image.Image)
 
 
-def test_cpu_render_bar_horizontal_zero_percent() -> None:
+def test_cpu_render_bar_horizontal_zero_percent(mock_cpu_psutil: Mock) -> None:
     """
     Тест рендеринга бара с 0% загрузкой.
 
     Edge case: Пустой бар (только рамка если bar_border=True).
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
-        mock_psutil.cpu_percent.return_value = 0.0
+    mock_cpu_psutil.cpu_percent.return_value = 0.0
 
-        widget = CPUWidget(display_mode="bar_horizontal")
-        widget.set_size(128, 40)
-        widget.update()
+    widget = CPUWidget(display_mode="bar_horizontal")
+    widget.set_size(128, 40)
+    widget.update()
 
-        image = widget.render()
+    image = widget.render()
 
-        assert isinstance(image, Image.Image)
+    assert isinstance(image, Image.Image)
 
 
-def test_cpu_render_bar_horizontal_100_percent() -> None:
+def test_cpu_render_bar_horizontal_100_percent(mock_cpu_psutil: Mock) -> None:
     """
     Тест рендеринга бара с 100% загрузкой.
 
     Edge case: Полностью заполненный бар.
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
-        mock_psutil.cpu_percent.return_value = 100.0
+    mock_cpu_psutil.cpu_percent.return_value = 100.0
 
-        widget = CPUWidget(display_mode="bar_horizontal")
-        widget.set_size(128, 40)
-        widget.update()
+    widget = CPUWidget(display_mode="bar_horizontal")
+    widget.set_size(128, 40)
+    widget.update()
 
-        image = widget.render()
+    image = widget.render()
 
-        assert isinstance(image, Image.Image)
+    assert isinstance(image, Image.Image)
 
 
 # =============================================================================
 # Тесты _render_bar_vertical()
 # =============================================================================
 
-def test_cpu_render_bar_vertical_aggregate() -> None:
+def test_cpu_render_bar_vertical_aggregate(mock_cpu_psutil: Mock) -> None:
     """
     Тест рендеринга вертикального бара (aggregate).
 
     Проверяет что рисуется один вертикальный столбец.
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
-        mock_psutil.cpu_percent.return_value = 60.0
+    mock_cpu_psutil.cpu_percent.return_value = 60.0
 
-        widget = CPUWidget(display_mode="bar_vertical", per_core=False)
-        widget.set_size(128, 40)
-        widget.update()
+    widget = CPUWidget(display_mode="bar_vertical", per_core=False)
+    widget.set_size(128, 40)
+    widget.update()
 
-        image = widget.render()
+    image = widget.render()
 
-        assert isinstance(image, Image.Image)
+    assert isinstance(image, Image.Image)
 
 
-def test_cpu_render_bar_vertical_per_core() -> None:
+def test_cpu_render_bar_vertical_per_core(mock_cpu_psutil: Mock) -> None:
     """
     Тест рендеринга вертикальных баров (per-core).
 
     Проверяет что рисуется по столбцу на каждое ядро.
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
-        mock_psutil.cpu_percent.return_value = [10.0, 30.0, 60.0, 90.0]
+    mock_cpu_psutil.cpu_percent.return_value = [10.0, 30.0, 60.0, 90.0]
 
-        widget = CPUWidget(display_mode="bar_vertical", per_core=True)
-        widget.set_size(128, 40)
-        widget.update()
+    widget = CPUWidget(display_mode="bar_vertical", per_core=True)
+    widget.set_size(128, 40)
+    widget.update()
 
-        image = widget.render()
+    image = widget.render()
 
-        assert isinstance(image, Image.Image)
+    assert isinstance(image, Image.Image)
 
 
 # =============================================================================
 # Тесты _render_graph()
 # =============================================================================
 
-def test_cpu_render_graph_with_history() -> None:
+def test_cpu_render_graph_with_history(mock_cpu_psutil: Mock) -> None:
     """
     Тест рендеринга графика с историей.
 
     Проверяет что график использует _usage_history.
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
+    widget = CPUWidget(display_mode="graph", history_length=5)
+    widget.set_size(128, 40)
 
-        widget = CPUWidget(display_mode="graph", history_length=5)
-        widget.set_size(128, 40)
+    # Добавляем историю
+    for i in range(5):
+        mock_cpu_psutil.cpu_percent.return_value = float(i * 20)
+        widget.update()
 
-        # Добавляем историю
-        for i in range(5):
-            mock_psutil.cpu_percent.return_value = float(i * 20)
-            widget.update()
+    image = widget.render()
 
-        image = widget.render()
+    assert isinstance(image, Image.Image)
+    assert len(widget._usage_history) == 5
 
-        assert isinstance(image, Image.Image)
-        assert len(widget._usage_history) == 5
 
-
-def test_cpu_render_graph_empty_history() -> None:
+def test_cpu_render_graph_empty_history(mock_cpu_psutil: Mock) -> None:
     """
     Тест рендеринга графика без истории.
 
     Edge case: График должен отрисоваться даже если история пустая.
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
-        mock_psutil.cpu_percent.return_value = 50.0
+    mock_cpu_psutil.cpu_percent.return_value = 50.0
 
-        widget = CPUWidget(display_mode="graph")
-        widget.set_size(128, 40)
-        # Не вызываем update(), история пустая
+    widget = CPUWidget(display_mode="graph")
+    widget.set_size(128, 40)
+    # Не вызываем update(), история пустая
 
-        image = widget.render()
+    image = widget.render()
 
-        assert isinstance(image, Image.Image)
+    assert isinstance(image, Image.Image)
 
 
 # =============================================================================
 # Тесты get_update_interval()
 # =============================================================================
 
-def test_cpu_get_update_interval_default() -> None:
+def test_cpu_get_update_interval_default(mock_cpu_psutil: Mock) -> None:
     """
     Тест get_update_interval() с дефолтным значением.
 
     Проверяет что интервал обновления возвращается корректно.
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
-
-        widget = CPUWidget()
-        assert widget.get_update_interval() == 1.0
+    widget = CPUWidget()
+    assert widget.get_update_interval() == 1.0
 
 
-def test_cpu_get_update_interval_custom() -> None:
+def test_cpu_get_update_interval_custom(mock_cpu_psutil: Mock) -> None:
     """
     Тест get_update_interval() с кастомным значением.
 
     Проверяет что custom interval сохраняется.
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
-
-        widget = CPUWidget(update_interval=2.5)
-        assert widget.get_update_interval() == 2.5
+    widget = CPUWidget(update_interval=2.5)
+    assert widget.get_update_interval() == 2.5
 
 
 # =============================================================================
 # Тесты стилизации и edge cases
 # =============================================================================
 
-def test_cpu_render_with_padding() -> None:
+def test_cpu_render_with_padding(mock_cpu_psutil: Mock) -> None:
     """
     Тест рендеринга с padding.
 
     Проверяет что padding применяется.
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
-        mock_psutil.cpu_percent.return_value = 50.0
+    mock_cpu_psutil.cpu_percent.return_value = 50.0
 
-        widget = CPUWidget(padding=10)
-        widget.set_size(128, 40)
-        widget.update()
+    widget = CPUWidget(padding=10)
+    widget.set_size(128, 40)
+    widget.update()
 
-        image = widget.render()
+    image = widget.render()
 
-        assert isinstance(image, Image.Image)
+    assert isinstance(image, Image.Image)
 
 
-def test_cpu_render_different_sizes() -> None:
+def test_cpu_render_different_sizes(mock_cpu_psutil: Mock) -> None:
     """
     Тест рендеринга с различными размерами.
 
     Проверяет что render адаптируется к размеру виджета.
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
-        mock_psutil.cpu_percent.return_value = 50.0
+    mock_cpu_psutil.cpu_percent.return_value = 50.0
 
-        widget = CPUWidget()
-        widget.update()
+    widget = CPUWidget()
+    widget.update()
 
-        # Разные размеры
-        for width, height in [(64, 20), (128, 40), (256, 80)]:
-            widget.set_size(width, height)
-            image = widget.render()
-            assert image.size == (width, height)
+    # Разные размеры
+    for width, height in [(64, 20), (128, 40), (256, 80)]:
+        widget.set_size(width, height)
+        image = widget.render()
+        assert image.size == (width, height)
 
 
-def test_cpu_render_unknown_display_mode() -> None:
+def test_cpu_render_unknown_display_mode(mock_cpu_psutil: Mock) -> None:
     """
     Тест рендеринга с неизвестным display_mode.
 
     Edge case: Должен логировать warning и вернуть пустое изображение.
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
-        mock_psutil.cpu_percent.return_value = 50.0
+    mock_cpu_psutil.cpu_percent.return_value = 50.0
 
-        widget = CPUWidget(display_mode="invalid_mode")
-        widget.set_size(128, 40)
-        widget.update()
+    widget = CPUWidget(display_mode="invalid_mode")
+    widget.set_size(128, 40)
+    widget.update()
 
-        image = widget.render()
+    image = widget.render()
 
-        # Должен вернуть изображение (пустое, т.к. режим неизвестен)
-        assert isinstance(image, Image.Image)
+    # Должен вернуть изображение (пустое, т.к. режим неизвестен)
+    assert isinstance(image, Image.Image)
 
 
 # =============================================================================
 # Интеграционные тесты
 # =============================================================================
 
-def test_cpu_full_workflow_aggregate() -> None:
+def test_cpu_full_workflow_aggregate(mock_cpu_psutil: Mock) -> None:
     """
     Тест полного workflow CPU widget в aggregate режиме.
 
     Интеграционный тест: init -> update -> render.
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
-        mock_psutil.cpu_percent.return_value = 65.0
+    mock_cpu_psutil.cpu_percent.return_value = 65.0
 
-        widget = CPUWidget(
-            name="TestCPU",
-            display_mode="bar_horizontal",
-            per_core=False,
-            border=True
-        )
-        widget.set_size(128, 40)
+    widget = CPUWidget(
+        name="TestCPU",
+        display_mode="bar_horizontal",
+        per_core=False,
+        border=True
+    )
+    widget.set_size(128, 40)
 
-        # Update
-        widget.update()
-        assert widget._current_usage == 65.0
+    # Update
+    widget.update()
+    assert widget._current_usage == 65.0
 
-        # Render
-        image = widget.render()
-        assert image.size == (128, 40)
+    # Render
+    image = widget.render()
+    assert image.size == (128, 40)
 
 
 def test_cpu_full_workflow_per_core() -> None:
@@ -817,24 +743,21 @@ def test_cpu_full_workflow_per_core() -> None:
         assert image.size == (256, 40)
 
 
-def test_cpu_multiple_updates_and_renders() -> None:
+def test_cpu_multiple_updates_and_renders(mock_cpu_psutil: Mock) -> None:
     """
     Тест множественных обновлений и рендеров.
 
     Проверяет что виджет корректно обрабатывает циклы обновления.
     """
-    with patch('widgets.cpu.psutil') as mock_psutil:
-        mock_psutil.cpu_count.return_value = 4
+    widget = CPUWidget(display_mode="graph", history_length=10)
+    widget.set_size(128, 40)
 
-        widget = CPUWidget(display_mode="graph", history_length=10)
-        widget.set_size(128, 40)
-
-        # Несколько циклов обновления
-        for i in range(15):
-            mock_psutil.cpu_percent.return_value = float(i * 5 % 100)
-            widget.update()
-            image = widget.render()
-            assert isinstance(image, Image.Image)
+    # Несколько циклов обновления
+    for i in range(15):
+        mock_cpu_psutil.cpu_percent.return_value = float(i * 5 % 100)
+        widget.update()
+        image = widget.render()
+        assert isinstance(image, Image.Image)
 
-        # История должна содержать последние 10 образцов
-        assert len(widget._usage_history) == 10
+    # История должна содержать последние 10 образцов
+    assert len(widget._usage_history) == 10
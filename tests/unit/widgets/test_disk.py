@@ -16,11 +16,30 @@ Unit tests для widgets.disk - виджет мониторинга диско
 """
 
 import pytest
+from collections import deque, namedtuple
 from unittest.mock import patch, Mock
 from PIL import Image
 from widgets.disk import DiskWidget
 
 
+# Лёгкая замена результата psutil.disk_io_counters() для диска:
+# доступ к полям namedtuple дешевле, чем к атрибутам Mock
+DiskCounters = namedtuple('DiskCounters', ['read_bytes', 'write_bytes'])
+
+# DiskWidget измеряет интервалы через time.monotonic_ns()
+NS_PER_SEC = 1_000_000_000
+
+# Мегабайт в байтах (скорости виджета хранятся в байтах/сек)
+MB = 1024 * 1024
+
+# Последовательность счётчиков для циклов update/render: READ +1 MB, WRITE +0.5 MB за шаг.
+# Создаётся один раз на модуль, а не в каждой итерации теста
+_CYCLE_COUNTERS = tuple(
+    DiskCounters(read_bytes=1000000 + i * MB, write_bytes=500000 + i * MB // 2)
+    for i in range(5)
+)
+
+
 # =============================================================================
 # Тесты инициализации
 # =============================================================================
@@ -38,7 +57,7 @@ def test_disk_init_requires_psutil() -> None:
         assert "psutil library is required" in str(exc_info.value)
 
 
-def test_disk_init_default_values() -> None:
+def test_disk_init_default_values(mock_disk_psutil: Mock) -> None:
     """
     Тест инициализации с дефолтными значениями.
 
@@ -49,54 +68,50 @@ def test_disk_init_default_values() -> None:
     - Интервал обновления
     - История пустая
     """
-    with patch('widgets.disk.psutil') as mock_psutil:
-        mock_psutil.disk_io_counters.return_value = {"sda": Mock()}
+    mock_disk_psutil.disk_io_counters.return_value = {"sda": DiskCounters(0, 0)}
 
-        widget = DiskWidget()
+    widget = DiskWidget()
 
-        assert widget.name == "Disk"
-        assert widget.display_mode == "bar_horizontal"
-        assert widget.disk_name is None
-        assert widget.update_interval_sec == 1.0
-        assert widget.history_length == 30
-        assert widget._current_read_speed == 0.0
-        assert widget._current_write_speed == 0.0
-        assert len(widget._read_history) == 0
-        assert len(widget._write_history) == 0
+    assert widget.name == "Disk"
+    assert widget.display_mode == "bar_horizontal"
+    assert widget.disk_name is None
+    assert widget.update_interval_sec == 1.0
+    assert widget.history_length == 30
+    assert widget._current_read_speed == 0.0
+    assert widget._current_write_speed == 0.0
+    assert len(widget._read_history) == 0
+    assert len(widget._write_history) == 0
 
 
-def test_disk_init_custom_values() -> None:
+def test_disk_init_custom_values(mock_disk_psutil: Mock) -> None:
     """
     Тест инициализации с кастомными значениями.
 
     Проверяет корректную установку всех параметров.
     """
-    with patch('widgets.disk.psutil') as mock_psutil:
-        mock_psutil.disk_io_counters.return_value = {}
-
-        widget = DiskWidget(
-            name="CustomDisk",
-            disk_name="sda",
-            display_mode="graph",
-            update_interval=0.5,
-            history_length=60,
-            max_speed_mbps=100.0,
-            read_color=200,
-            write_color=150
-        )
-
-        assert widget.name == "CustomDisk"
-        assert widget.disk_name == "sda"
-        assert widget.display_mode == "graph"
-        assert widget.update_interval_sec == 0.5
-        assert widget.history_length == 60
-        assert widget.max_speed_mbps == 100.0
-        assert widget.read_color == 200
-        assert widget.write_color == 150
+    widget = DiskWidget(
+        name="CustomDisk",
+        disk_name="sda",
+        display_mode="graph",
+        update_interval=0.5,
+        history_length=60,
+        max_speed_mbps=100.0,
+        read_color=200,
+        write_color=150
+    )
+
+    assert widget.name == "CustomDisk"
+    assert widget.disk_name == "sda"
+    assert widget.display_mode == "graph"
+    assert widget.update_interval_sec == 0.5
+    assert widget.history_length == 60
+    assert widget.max_speed_mbps == 100.0
+    assert widget.read_color == 200
+    assert widget.write_color == 150
 
 
 @pytest.mark.parametrize("mode", ["text", "bar_horizontal", "bar_vertical", "graph"])
-def test_disk_init_all_display_modes(mode: str) -> None:
+def test_disk_init_all_display_modes(mode: str, mock_disk_psutil: Mock) -> None:
     """
     Параметризованный тест проверяет все 4 режима отображения.
 
@@ -106,61 +121,48 @@ def test_disk_init_all_display_modes(mode: str) -> None:
     - bar_vertical: Два вертикальных столбца
     - graph: График истории скоростей
     """
-    with patch('widgets.disk.psutil') as mock_psutil:
-        mock_psutil.disk_io_counters.return_value = {}
-
-        widget = DiskWidget(display_mode=mode, disk_name="sda")
-        assert widget.display_mode == mode
+    widget = DiskWidget(display_mode=mode, disk_name="sda")
+    assert widget.display_mode == mode
 
 
-def test_disk_init_dynamic_scaling() -> None:
+def test_disk_init_dynamic_scaling(mock_disk_psutil: Mock) -> None:
     """
     Тест инициализации с динамическим масштабированием.
 
     При max_speed_mbps <= 0 должно использоваться динамическое масштабирование.
     """
-    with patch('widgets.disk.psutil') as mock_psutil:
-        mock_psutil.disk_io_counters.return_value = {}
+    widget = DiskWidget(max_speed_mbps=-1, disk_name="sda")
 
-        widget = DiskWidget(max_speed_mbps=-1, disk_name="sda")
+    assert widget.max_speed_mbps == -1
+    assert widget._peak_read_speed == 1.0  # Начальное значение
+    assert widget._peak_write_speed == 1.0
 
-        assert widget.max_speed_mbps == -1
-        assert widget._peak_read_speed == 1.0  # Начальное значение
-        assert widget._peak_write_speed == 1.0
 
-
-def test_disk_init_fixed_scaling() -> None:
+def test_disk_init_fixed_scaling(mock_disk_psutil: Mock) -> None:
     """
     Тест инициализации с фиксированным масштабированием.
 
     При max_speed_mbps > 0 должен использоваться фиксированный масштаб.
     """
-    with patch('widgets.disk.psutil') as mock_psutil:
-        mock_psutil.disk_io_counters.return_value = {}
-
-        widget = DiskWidget(max_speed_mbps=500.0, disk_name="sda")
+    widget = DiskWidget(max_speed_mbps=500.0, disk_name="sda")
 
-        assert widget.max_speed_mbps == 500.0
+    assert widget.max_speed_mbps == 500.0
 
 
 # =============================================================================
 # Тесты автовыбора диска
 # =============================================================================
 
-def test_disk_auto_select_first_disk() -> None:
+def test_disk_auto_select_first_disk(mock_disk_psutil: Mock) -> None:
     """
     Тест автовыбора первого доступного диска.
 
     Когда disk_name=None, должен выбрать первый диск из списка.
     """
-    with patch('widgets.disk.psutil') as mock_psutil, \
-         patch('time.time') as mock_time:
-
-        mock_counter = Mock()
-        mock_counter.read_bytes = 1000000
-        mock_counter.write_bytes = 500000
-        mock_psutil.disk_io_counters.return_value = {"sda": mock_counter, "sdb": mock_counter}
-        mock_time.return_value = 100.0
+    with patch('time.monotonic_ns') as mock_time:
+        mock_counter = DiskCounters(read_bytes=1000000, write_bytes=500000)
+        mock_disk_psutil.disk_io_counters.return_value = {"sda": mock_counter, "sdb": mock_counter}
+        mock_time.return_value = 100 * NS_PER_SEC
 
         widget = DiskWidget(disk_name=None)
         widget.update()
@@ -173,20 +175,16 @@ def test_disk_auto_select_first_disk() -> None:
 # Тесты update()
 # =============================================================================
 
-def test_disk_update_first_call_initializes() -> None:
+def test_disk_update_first_call_initializes(mock_disk_psutil: Mock) -> None:
     """
     Тест первого вызова update() инициализирует счётчики.
 
     Edge case: При первом вызове нет предыдущих данных, скорость не вычисляется.
     """
-    with patch('widgets.disk.psutil') as mock_psutil, \
-         patch('time.time') as mock_time:
-
-        mock_counter = Mock()
-        mock_counter.read_bytes = 1000000
-        mock_counter.write_bytes = 500000
-        mock_psutil.disk_io_counters.return_value = {"sda": mock_counter}
-        mock_time.return_value = 100.0
+    with patch('time.monotonic_ns') as mock_time:
+        mock_counter = DiskCounters(read_bytes=1000000, write_bytes=500000)
+        mock_disk_psutil.disk_io_counters.return_value = {"sda": mock_counter}
+        mock_time.return_value = 100 * NS_PER_SEC
 
         widget = DiskWidget(disk_name="sda")
         widget.update()
@@ -194,34 +192,30 @@ def test_disk_update_first_call_initializes() -> None:
         # Первый вызов инициализирует счётчики, но не вычисляет скорость
         assert widget._last_read_bytes == 1000000
         assert widget._last_write_bytes == 500000
-        assert widget._last_update_time == 100.0
+        assert widget._last_update_time == 100 * NS_PER_SEC
 
 
-def test_disk_update_calculates_speed() -> None:
+def test_disk_update_calculates_speed(mock_disk_psutil: Mock) -> None:
     """
     Тест расчёта скорости на основе дельты байтов.
 
     Проверяет формулу: speed = (bytes_delta) / (time_delta)
     """
-    with patch('widgets.disk.psutil') as mock_psutil, \
-         patch('time.time') as mock_time:
-
+    with patch('time.monotonic_ns') as mock_time:
         # Первый вызов
-        mock_counter1 = Mock()
-        mock_counter1.read_bytes = 1000000
-        mock_counter1.write_bytes = 500000
-        mock_psutil.disk_io_counters.return_value = {"sda": mock_counter1}
-        mock_time.return_value = 100.0
+        mock_counter1 = DiskCounters(read_bytes=1000000, write_bytes=500000)
+        mock_disk_psutil.disk_io_counters.return_value = {"sda": mock_counter1}
+        mock_time.return_value = 100 * NS_PER_SEC
 
         widget = DiskWidget(disk_name="sda")
         widget.update()
 
         # Второй вызов через 1 секунду
-        mock_counter2 = Mock()
-        mock_counter2.read_bytes = 1104857600  # +1100 MB (примерно 1100 MB/s)
-        mock_counter2.write_bytes = 552428800   # +550 MB (примерно 550 MB/s)
-        mock_psutil.disk_io_counters.return_value = {"sda": mock_counter2}
-        mock_time.return_value = 101.0
+        # READ: +1100 MB (примерно 1100 MB/s)
+        # WRITE: +550 MB (примерно 550 MB/s)
+        mock_counter2 = DiskCounters(read_bytes=1104857600, write_bytes=552428800)
+        mock_disk_psutil.disk_io_counters.return_value = {"sda": mock_counter2}
+        mock_time.return_value = 101 * NS_PER_SEC
 
         widget.update()
 
@@ -232,18 +226,16 @@ def test_disk_update_calculates_speed() -> None:
         assert widget._current_write_speed == pytest.approx(expected_write_speed, rel=0.01)
 
 
-def test_disk_update_missing_disk() -> None:
+def test_disk_update_missing_disk(mock_disk_psutil: Mock) -> None:
     """
     Тест update() когда диск не найден.
 
     Edge case: Должен установить скорость в 0 и залогировать предупреждение.
     """
-    with patch('widgets.disk.psutil') as mock_psutil, \
-         patch('time.time') as mock_time:
-
+    with patch('time.monotonic_ns') as mock_time:
         # Диск sda не найден
-        mock_psutil.disk_io_counters.return_value = {"sdb": Mock()}
-        mock_time.return_value = 100.0
+        mock_disk_psutil.disk_io_counters.return_value = {"sdb": DiskCounters(0, 0)}
+        mock_time.return_value = 100 * NS_PER_SEC
 
         widget = DiskWidget(disk_name="sda")
         widget.update()
@@ -252,31 +244,26 @@ def test_disk_update_missing_disk() -> None:
         assert widget._current_write_speed == 0.0
 
 
-def test_disk_update_negative_delta_clamped() -> None:
+def test_disk_update_negative_delta_clamped(mock_disk_psutil: Mock) -> None:
     """
     Тест что отрицательная дельта (сброс счётчика) обрабатывается.
 
     Edge case: Если read_bytes уменьшился (счётчик обнулён), скорость = 0.
     """
-    with patch('widgets.disk.psutil') as mock_psutil, \
-         patch('time.time') as mock_time:
-
+    with patch('time.monotonic_ns') as mock_time:
         # Первый вызов
-        mock_counter1 = Mock()
-        mock_counter1.read_bytes = 1000000
-        mock_counter1.write_bytes = 500000
-        mock_psutil.disk_io_counters.return_value = {"sda": mock_counter1}
-        mock_time.return_value = 100.0
+        mock_counter1 = DiskCounters(read_bytes=1000000, write_bytes=500000)
+        mock_disk_psutil.disk_io_counters.return_value = {"sda": mock_counter1}
+        mock_time.return_value = 100 * NS_PER_SEC
 
         widget = DiskWidget(disk_name="sda")
         widget.update()
 
         # Второй вызов - счётчик обнулён
-        mock_counter2 = Mock()
-        mock_counter2.read_bytes = 100  # Меньше чем было
-        mock_counter2.write_bytes = 50
-        mock_psutil.disk_io_counters.return_value = {"sda": mock_counter2}
-        mock_time.return_value = 101.0
+        # Счётчики меньше чем было
+        mock_counter2 = DiskCounters(read_bytes=100, write_bytes=50)
+        mock_disk_psutil.disk_io_counters.return_value = {"sda": mock_counter2}
+        mock_time.return_value = 101 * NS_PER_SEC
 
         widget.update()
 
@@ -285,20 +272,16 @@ def test_disk_update_negative_delta_clamped() -> None:
         assert widget._current_write_speed == 0.0
 
 
-def test_disk_update_zero_time_delta() -> None:
+def test_disk_update_zero_time_delta(mock_disk_psutil: Mock) -> None:
     """
     Тест update() когда time_delta = 0 (мгновенный вызов).
 
     Edge case: Деление на 0 должно быть обработано.
     """
-    with patch('widgets.disk.psutil') as mock_psutil, \
-         patch('time.time') as mock_time:
-
-        mock_counter = Mock()
-        mock_counter.read_bytes = 1000000
-        mock_counter.write_bytes = 500000
-        mock_psutil.disk_io_counters.return_value = {"sda": mock_counter}
-        mock_time.return_value = 100.0
+    with patch('time.monotonic_ns') as mock_time:
+        mock_counter = DiskCounters(read_bytes=1000000, write_bytes=500000)
+        mock_disk_psutil.disk_io_counters.return_value = {"sda": mock_counter}
+        mock_time.return_value = 100 * NS_PER_SEC
 
         widget = DiskWidget(disk_name="sda")
         widget.update()
@@ -308,31 +291,25 @@ def test_disk_update_zero_time_delta() -> None:
         # (вторая update не вычисляет скорость при time_delta=0)
 
 
-def test_disk_update_tracks_peak_speeds() -> None:
+def test_disk_update_tracks_peak_speeds(mock_disk_psutil: Mock) -> None:
     """
     Тест что update() отслеживает пиковые скорости для динамического масштабирования.
 
     Пиковые скорости должны обновляться при превышении.
     """
-    with patch('widgets.disk.psutil') as mock_psutil, \
-         patch('time.time') as mock_time:
-
+    with patch('time.monotonic_ns') as mock_time:
         widget = DiskWidget(disk_name="sda", max_speed_mbps=-1)  # Динамическое масштабирование
 
         # Первый update - инициализация
-        mock_counter1 = Mock()
-        mock_counter1.read_bytes = 0
-        mock_counter1.write_bytes = 0
-        mock_psutil.disk_io_counters.return_value = {"sda": mock_counter1}
-        mock_time.return_value = 100.0
+        mock_counter1 = DiskCounters(read_bytes=0, write_bytes=0)
+        mock_disk_psutil.disk_io_counters.return_value = {"sda": mock_counter1}
+        mock_time.return_value = 100 * NS_PER_SEC
         widget.update()
 
         # Второй update - 10 MB/s чтения, 5 MB/s записи
-        mock_counter2 = Mock()
-        mock_counter2.read_bytes = 10 * 1024 * 1024
-        mock_counter2.write_bytes = 5 * 1024 * 1024
-        mock_psutil.disk_io_counters.return_value = {"sda": mock_counter2}
-        mock_time.return_value = 101.0
+        mock_counter2 = DiskCounters(read_bytes=10 * 1024 * 1024, write_bytes=5 * 1024 * 1024)
+        mock_disk_psutil.disk_io_counters.return_value = {"sda": mock_counter2}
+        mock_time.return_value = 101 * NS_PER_SEC
         widget.update()
 
         assert widget._peak_read_speed >= 10.0
@@ -343,80 +320,72 @@ def test_disk_update_tracks_peak_speeds() -> None:
 # Тесты истории для graph режима
 # =============================================================================
 
-def test_disk_update_graph_mode_adds_to_history() -> None:
+def test_disk_update_graph_mode_adds_to_history(mock_disk_psutil: Mock) -> None:
     """
     Тест что в graph режиме данные добавляются в историю.
 
     Проверяет добавление в _read_history и _write_history.
     """
-    with patch('widgets.disk.psutil') as mock_psutil, \
-         patch('time.time') as mock_time:
-
+    with patch('time.monotonic_ns') as mock_time:
         widget = DiskWidget(display_mode="graph", history_length=10, disk_name="sda")
 
         # Первый update
-        mock_counter1 = Mock()
-        mock_counter1.read_bytes = 1000000
-        mock_counter1.write_bytes = 500000
-        mock_psutil.disk_io_counters.return_value = {"sda": mock_counter1}
-        mock_time.return_value = 100.0
+        mock_counter1 = DiskCounters(read_bytes=1000000, write_bytes=500000)
+        mock_disk_psutil.disk_io_counters.return_value = {"sda": mock_counter1}
+        mock_time.return_value = 100 * NS_PER_SEC
         widget.update()
 
         # Второй update
-        mock_counter2 = Mock()
-        mock_counter2.read_bytes = 1128000
-        mock_counter2.write_bytes = 564000
-        mock_psutil.disk_io_counters.return_value = {"sda": mock_counter2}
-        mock_time.return_value = 101.0
+        mock_counter2 = DiskCounters(read_bytes=1128000, write_bytes=564000)
+        mock_disk_psutil.disk_io_counters.return_value = {"sda": mock_counter2}
+        mock_time.return_value = 101 * NS_PER_SEC
         widget.update()
 
         assert len(widget._read_history) >= 1
         assert len(widget._write_history) >= 1
 
 
-def test_disk_update_graph_mode_respects_max_length() -> None:
+def test_disk_update_graph_mode_respects_max_length(mock_disk_psutil: Mock) -> None:
     """
     Тест что deque соблюдает maxlen.
 
     Edge case: Старые значения вытесняются новыми.
     """
-    with patch('widgets.disk.psutil') as mock_psutil, \
-         patch('time.time') as mock_time:
-
+    with patch('time.monotonic_ns') as mock_time:
         widget = DiskWidget(display_mode="graph", history_length=3, disk_name="sda")
 
-        # Делаем 5 обновлений
+        # Каждый update() получает следующее время: 100, 101, ... секунд
+        mock_time.side_effect = [(100 + i) * NS_PER_SEC for i in range(5)]
+
+        # Делаем 5 обновлений с растущей скоростью: 0, 100K, 300K, 500K, 700K байт/сек
         for i in range(5):
-            mock_counter = Mock()
-            mock_counter.read_bytes = 1000000 + i * 100000
-            mock_counter.write_bytes = 500000 + i * 50000
-            mock_psutil.disk_io_counters.return_value = {"sda": mock_counter}
-            mock_time.return_value = 100.0 + i
+            mock_counter = DiskCounters(read_bytes=1000000 + i * i * 100000, write_bytes=500000 + i * i * 50000)
+            mock_disk_psutil.disk_io_counters.return_value = {"sda": mock_counter}
             widget.update()
 
-        # История должна содержать не более 3 значений
-        assert len(widget._read_history) <= 3
-        assert len(widget._write_history) <= 3
+        # История - кольцевой буфер: ровно 3 последних значения, старые вытеснены
+        assert isinstance(widget._read_history, deque)
+        assert widget._read_history.maxlen == widget.history_length
+        assert list(widget._read_history) == pytest.approx([300000.0, 500000.0, 700000.0])
+        assert list(widget._write_history) == pytest.approx([150000.0, 250000.0, 350000.0])
 
 
-def test_disk_update_non_graph_mode_no_history() -> None:
+def test_disk_update_non_graph_mode_no_history(mock_disk_psutil: Mock) -> None:
     """
     Тест что в не-graph режимах история не сохраняется.
 
     В bar/text режимах _read_history и _write_history должны быть пустыми.
     """
-    with patch('widgets.disk.psutil') as mock_psutil, \
-         patch('time.time') as mock_time:
-
+    with patch('time.monotonic_ns') as mock_time:
         widget = DiskWidget(display_mode="bar_horizontal", disk_name="sda")
 
+        # Каждый update() получает следующее время: 100, 101, 102 секунды
+        mock_time.side_effect = [(100 + i) * NS_PER_SEC for i in range(3)]
+
         # Несколько обновлений
         for i in range(3):
-            mock_counter = Mock()
-            mock_counter.read_bytes = 1000000 + i * 100000
-            mock_counter.write_bytes = 500000 + i * 50000
-            mock_psutil.disk_io_counters.return_value = {"sda": mock_counter}
-            mock_time.return_value = 100.0 + i
+            mock_counter = DiskCounters(read_bytes=1000000 + i * 100000, write_bytes=500000 + i * 50000)
+            mock_disk_psutil.disk_io_counters.return_value = {"sda": mock_counter}
             widget.update()
 
         assert len(widget._read_history) == 0
@@ -427,20 +396,19 @@ def test_disk_update_non_graph_mode_no_history() -> None:
 # Тесты обработки ошибок
 # =============================================================================
 
-def test_disk_update_handles_psutil_error() -> None:
+def test_disk_update_handles_psutil_error(mock_disk_psutil: Mock) -> None:
     """
     Тест обработки исключения при вызове psutil.
 
     Если psutil.disk_io_counters() вызывает ошибку, должен установить скорость в 0.
     """
-    with patch('widgets.disk.psutil') as mock_psutil:
-        mock_psutil.disk_io_counters.side_effect = Exception("Disk error")
+    mock_disk_psutil.disk_io_counters.side_effect = Exception("Disk error")
 
-        widget = DiskWidget(disk_name="sda")
-        widget.update()
+    widget = DiskWidget(disk_name="sda")
+    widget.update()
 
-        assert widget._current_read_speed == 0.0
-        assert widget._current_write_speed == 0.0
+    assert widget._current_read_speed == 0.0
+    assert widget._current_write_speed == 0.0
 
 
 # =============================================================================
@@ -453,418 +421,343 @@ def test_disk_update_handles_psutil_error() -> None:
     (100 * 1024 * 1024, "100.0M"),      # 100 MB/s
     (1500 * 1024 * 1024, "1.5G"),       # 1.5 GB/s
 ])
-def test_disk_format_speed_units(bytes_per_sec: int, expected: str) -> None:
+def test_disk_format_speed_units(bytes_per_sec: int, expected: str, mock_disk_psutil: Mock) -> None:
     """
     Параметризованный тест форматирования скорости в K/M/G.
 
     Проверяет корректную конвертацию из bytes/sec.
     """
-    with patch('widgets.disk.psutil') as mock_psutil:
-        mock_psutil.disk_io_counters.return_value = {}
-
-        widget = DiskWidget(disk_name="sda")
-        result = widget._format_speed(bytes_per_sec)
-        assert result == expected
+    widget = DiskWidget(disk_name="sda")
+    result = widget._format_speed(bytes_per_sec)
+    assert result == expected
 
 
 # =============================================================================
 # Тесты расчёта процента скорости
 # =============================================================================
 
-def test_disk_get_speed_percentage_fixed_scaling() -> None:
+def test_disk_get_speed_percentage_fixed_scaling(mock_disk_psutil: Mock) -> None:
     """
     Тест расчёта процента с фиксированным масштабом.
 
     При max_speed_mbps = 100, 50 MB/s должно дать 50%.
     """
-    with patch('widgets.disk.psutil') as mock_psutil:
-        mock_psutil.disk_io_counters.return_value = {}
-
-        widget = DiskWidget(max_speed_mbps=100.0, disk_name="sda")
+    widget = DiskWidget(max_speed_mbps=100.0, disk_name="sda")
 
-        # 50 MB/s = 50 * 1024 * 1024 bytes/sec
-        speed_bytes = 50.0 * 1024 * 1024
-        percentage = widget._get_speed_percentage(speed_bytes, is_read=True)
+    # 50 MB/s = 50 * 1024 * 1024 bytes/sec
+    speed_bytes = 50.0 * 1024 * 1024
+    percentage = widget._get_speed_percentage(speed_bytes, is_read=True)
 
-        assert percentage == pytest.approx(50.0, abs=0.1)
+    assert percentage == pytest.approx(50.0, abs=0.1)
 
 
-def test_disk_get_speed_percentage_dynamic_scaling() -> None:
+def test_disk_get_speed_percentage_dynamic_scaling(mock_disk_psutil: Mock) -> None:
     """
     Тест расчёта процента с динамическим масштабом.
 
     Масштаб определяется пиковой скоростью.
     """
-    with patch('widgets.disk.psutil') as mock_psutil:
-        mock_psutil.disk_io_counters.return_value = {}
+    widget = DiskWidget(max_speed_mbps=-1, disk_name="sda")
 
-        widget = DiskWidget(max_speed_mbps=-1, disk_name="sda")
+    # Устанавливаем пиковую скорость
+    widget._peak_read_speed = 100.0  # 100 MB/s
 
-        # Устанавливаем пиковую скорость
-        widget._peak_read_speed = 100.0  # 100 MB/s
+    # При скорости 50 MB/s и пике 100 MB/s, процент = 50%
+    speed_bytes = 50.0 * 1024 * 1024
+    percentage = widget._get_speed_percentage(speed_bytes, is_read=True)
+    assert percentage == pytest.approx(50.0, abs=0.1)
 
-        # При скорости 50 MB/s и пике 100 MB/s, процент = 50%
-        speed_bytes = 50.0 * 1024 * 1024
-        percentage = widget._get_speed_percentage(speed_bytes, is_read=True)
-        assert percentage == pytest.approx(50.0, abs=0.1)
 
+def test_disk_get_speed_percentage_with_precomputed_max_speed(mock_disk_psutil: Mock) -> None:
+    """
+    Тест что переданный max_speed даёт тот же результат, что и вычисленный.
 
-def test_disk_get_speed_percentage_over_100() -> None:
+    График вычисляет масштаб один раз и передаёт его для каждой точки.
+    """
+    widget = DiskWidget(max_speed_mbps=-1, disk_name="sda")
+    widget._peak_read_speed = 80.0
+    widget._peak_write_speed = 0.5  # Ниже минимума 1 MB/s
+
+    speed_bytes = 30.0 * 1024 * 1024
+    for is_read in (True, False):
+        max_speed = widget._get_max_speed(is_read)
+        assert widget._get_speed_percentage(speed_bytes, max_speed=max_speed) == \
+            widget._get_speed_percentage(speed_bytes, is_read=is_read)
+
+    assert widget._get_max_speed(is_read=False) == 1.0
+
+
+def test_disk_get_speed_percentage_over_100(mock_disk_psutil: Mock) -> None:
     """
     Тест что процент ограничен 100%.
 
     Edge case: Скорость выше максимума должна давать 100%.
     """
-    with patch('widgets.disk.psutil') as mock_psutil:
-        mock_psutil.disk_io_counters.return_value = {}
+    widget = DiskWidget(max_speed_mbps=100.0, disk_name="sda")
 
-        widget = DiskWidget(max_speed_mbps=100.0, disk_name="sda")
+    # 200 MB/s (в 2 раза больше максимума)
+    speed_bytes = 200.0 * 1024 * 1024
+    percentage = widget._get_speed_percentage(speed_bytes, is_read=True)
 
-        # 200 MB/s (в 2 раза больше максимума)
-        speed_bytes = 200.0 * 1024 * 1024
-        percentage = widget._get_speed_percentage(speed_bytes, is_read=True)
-
-        assert percentage == 100.0
+    assert percentage == 100.0
 
 
 # =============================================================================
 # Тесты render() общие
 # =============================================================================
 
-def test_disk_render_returns_image() -> None:
+def test_disk_render_returns_image(mock_disk_psutil: Mock) -> None:
     """
     Тест что render() возвращает PIL Image.
 
     Проверяет корректный тип и размер изображения.
     """
-    with patch('widgets.disk.psutil') as mock_psutil:
-        mock_psutil.disk_io_counters.return_value = {}
-
-        widget = DiskWidget(disk_name="sda")
-        widget.set_size(128, 40)
+    widget = DiskWidget(disk_name="sda")
+    widget.set_size(128, 40)
 
-        image = widget.render()
+    image = widget.render()
 
-        assert isinstance(image, Image.Image)
-        assert image.size == (128, 40)
+    assert isinstance(image, Image.Image)
+    assert image.size == (128, 40)
 
 
-def test_disk_render_with_border() -> None:
+def test_disk_render_with_border(mock_disk_psutil: Mock) -> None:
     """
     Тест рендеринга с рамкой виджета.
 
     Проверяет что border рисуется.
     """
-    with patch('widgets.disk.psutil') as mock_psutil:
-        mock_psutil.disk_io_counters.return_value = {}
-
-        widget = DiskWidget(border=True, disk_name="sda")
-        widget.set_size(128, 40)
+    widget = DiskWidget(border=True, disk_name="sda")
+    widget.set_size(128, 40)
 
-        image = widget.render()
+    image = widget.render()
 
-        assert image is not None
+    assert image is not None
 
 
-def test_disk_render_with_alpha_channel() -> None:
+def test_disk_render_with_alpha_channel(mock_disk_psutil: Mock) -> None:
     """
     Тест рендеринга с альфа-каналом.
 
     При background_opacity < 255 должно создаться LA изображение.
     """
-    with patch('widgets.disk.psutil') as mock_psutil:
-        mock_psutil.disk_io_counters.return_value = {}
+    widget = DiskWidget(background_opacity=128, disk_name="sda")
+    widget.set_size(128, 40)
 
-        widget = DiskWidget(background_opacity=128, disk_name="sda")
-        widget.set_size(128, 40)
+    image = widget.render()
 
-        image = widget.render()
-
-        assert image.mode == 'LA'
+    assert image.mode == 'LA'
 
 
 # =============================================================================
 # Тесты render() в text режиме
 # =============================================================================
 
-def test_disk_render_text_mode() -> None:
+def test_disk_render_text_mode(mock_disk_psutil: Mock) -> None:
     """
     Тест рендеринга в text режиме.
 
     Должен отобразить "R:xxx" и "W:xxx".
     """
-    with patch('widgets.disk.psutil') as mock_psutil:
-        mock_psutil.disk_io_counters.return_value = {}
+    widget = DiskWidget(display_mode="text", disk_name="sda")
+    widget.set_size(128, 40)
+    widget._current_read_speed = 10 * 1024 * 1024  # 10 MB/s
+    widget._current_write_speed = 5 * 1024 * 1024  # 5 MB/s
 
-        widget = DiskWidget(display_mode="text", disk_name="sda")
-        widget.set_size(128, 40)
-        widget._current_read_speed = 10 * 1024 * 1024  # 10 MB/s
-        widget._current_write_speed = 5 * 1024 * 1024  # 5 MB/s
+    image = widget.render()
 
-        image = widget.render()
-
-        assert isinstance(image, Image.Image)
+    assert isinstance(image, Image.Image)
 
 
 # =============================================================================
 # Тесты render() в bar_horizontal режиме
 # =============================================================================
 
-def test_disk_render_bar_horizontal() -> None:
+def test_disk_render_bar_horizontal(mock_disk_psutil: Mock) -> None:
     """
     Тест рендеринга в bar_horizontal режиме.
 
     Должны быть нарисованы 2 горизонтальных бара (READ сверху, WRITE снизу).
     """
-    with patch('widgets.disk.psutil') as mock_psutil:
-        mock_psutil.disk_io_counters.return_value = {}
+    widget = DiskWidget(display_mode="bar_horizontal", max_speed_mbps=100.0, disk_name="sda")
+    widget.set_size(128, 40)
+    widget._current_read_speed = 50 * 1024 * 1024
+    widget._current_write_speed = 25 * 1024 * 1024
 
-        widget = DiskWidget(display_mode="bar_horizontal", max_speed_mbps=100.0, disk_name="sda")
-        widget.set_size(128, 40)
-        widget._current_read_speed = 50 * 1024 * 1024
-        widget._current_write_speed = 25 * 1024 * 1024
+    image = widget.render()
 
-        image = widget.render()
+    assert image.size == (128, 40)
+    assert image.getbbox() is not None
 
-        assert image.size == (128, 40)
-        pixels = list(image.getdata())
-        assert any(p > 0 for p in pixels)
 
-
-def test_disk_render_bar_horizontal_zero_speed() -> None:
+def test_disk_render_bar_horizontal_zero_speed(mock_disk_psutil: Mock) -> None:
     """
     Тест bar_horizontal при нулевой скорости.
 
     Edge case: При 0% не должно быть заполнения.
     """
-    with patch('widgets.disk.psutil') as mock_psutil:
-        mock_psutil.disk_io_counters.return_value = {}
-
-        widget = DiskWidget(display_mode="bar_horizontal", bar_border=False, disk_name="sda")
-        widget.set_size(128, 40)
-        widget._current_read_speed = 0.0
-        widget._current_write_speed = 0.0
+    widget = DiskWidget(display_mode="bar_horizontal", bar_border=False, disk_name="sda")
+    widget.set_size(128, 40)
+    widget._current_read_speed = 0.0
+    widget._current_write_speed = 0.0
 
-        image = widget.render()
+    image = widget.render()
 
-        pixels = list(image.getdata())
-        assert all(p == 0 for p in pixels)
+    # getbbox() возвращает None для полностью чёрного изображения
+    assert image.getbbox() is None
 
 
-def test_disk_render_bar_horizontal_max_speed() -> None:
+def test_disk_render_bar_horizontal_max_speed(mock_disk_psutil: Mock) -> None:
     """
     Тест bar_horizontal при максимальной скорости.
 
     Edge case: При 100% бары должны быть полностью заполнены.
     """
-    with patch('widgets.disk.psutil') as mock_psutil:
-        mock_psutil.disk_io_counters.return_value = {}
+    widget = DiskWidget(display_mode="bar_horizontal", max_speed_mbps=100.0, disk_name="sda")
+    widget.set_size(128, 40)
+    widget._current_read_speed = 100.0 * 1024 * 1024
+    widget._current_write_speed = 100.0 * 1024 * 1024
 
-        widget = DiskWidget(display_mode="bar_horizontal", max_speed_mbps=100.0, disk_name="sda")
-        widget.set_size(128, 40)
-        widget._current_read_speed = 100.0 * 1024 * 1024
-        widget._current_write_speed = 100.0 * 1024 * 1024
-
-        image = widget.render()
+    image = widget.render()
 
-        pixels = list(image.getdata())
-        white_pixels = sum(1 for p in pixels if p >= 200)
-        assert white_pixels > 50
+    # Гистограмма считается в C: число пикселей с яркостью 200-255
+    white_pixels = sum(image.histogram()[200:])
+    assert white_pixels > 50
 
 
 # =============================================================================
 # Тесты render() в bar_vertical режиме
 # =============================================================================
 
-def test_disk_render_bar_vertical() -> None:
+def test_disk_render_bar_vertical(mock_disk_psutil: Mock) -> None:
     """
     Тест рендеринга в bar_vertical режиме.
 
     Должны быть нарисованы 2 вертикальных бара (READ слева, WRITE справа).
     """
-    with patch('widgets.disk.psutil') as mock_psutil:
-        mock_psutil.disk_io_counters.return_value = {}
+    widget = DiskWidget(display_mode="bar_vertical", max_speed_mbps=100.0, disk_name="sda")
+    widget.set_size(128, 40)
+    widget._current_read_speed = 50 * 1024 * 1024
+    widget._current_write_speed = 25 * 1024 * 1024
 
-        widget = DiskWidget(display_mode="bar_vertical", max_speed_mbps=100.0, disk_name="sda")
-        widget.set_size(128, 40)
-        widget._current_read_speed = 50 * 1024 * 1024
-        widget._current_write_speed = 25 * 1024 * 1024
+    image = widget.render()
 
-        image = widget.render()
-
-        assert image.size == (128, 40)
-        pixels = list(image.getdata())
-        assert any(p > 0 for p in pixels)
+    assert image.size == (128, 40)
+    # getbbox() находит ненулевые пиксели на стороне C, без списка пикселей
+    assert image.getbbox() is not None
 
 
 # =============================================================================
 # Тесты render() в graph режиме
 # =============================================================================
 
-def test_disk_render_graph_with_history() -> None:
-    """
-    Тест рендеринга graph режима с данными.
-
-    Должны быть нарисованы 2 линии (READ и WRITE).
-    """
-    with patch('widgets.disk.psutil') as mock_psutil:
-        mock_psutil.disk_io_counters.return_value = {}
-
-        widget = DiskWidget(display_mode="graph", history_length=10, max_speed_mbps=100.0, disk_name="sda")
-        widget.set_size(128, 40)
-
-        # Добавляем данные в историю
-        for i in range(5):
-            widget._read_history.append(float(i * 10 * 1024 * 1024))
-            widget._write_history.append(float(i * 5 * 1024 * 1024))
-
-        image = widget.render()
-
-        assert image.size == (128, 40)
-
-
-def test_disk_render_graph_empty_history() -> None:
-    """
-    Тест graph режима с пустой историей.
-
-    Edge case: С <2 точками график не рисуется.
-    """
-    with patch('widgets.disk.psutil') as mock_psutil:
-        mock_psutil.disk_io_counters.return_value = {}
-
-        widget = DiskWidget(display_mode="graph", disk_name="sda")
-        widget.set_size(128, 40)
-
-        # История пустая
-        assert len(widget._read_history) == 0
-        assert len(widget._write_history) == 0
-
-        image = widget.render()
-
-        # Изображение создано, но график не нарисован
-        assert image.size == (128, 40)
-
-
-def test_disk_render_graph_insufficient_data() -> None:
+@pytest.mark.parametrize("n_points,expect_graph", [
+    (0, False),  # Пустая история
+    (1, False),  # 1 точка: график не рисуется (нужно минимум 2)
+    (5, True),   # Достаточно данных: 2 линии (READ и WRITE)
+])
+def test_disk_render_graph(n_points: int, expect_graph: bool, mock_disk_psutil: Mock) -> None:
     """
-    Тест graph режима с недостаточным количеством данных.
+    Параметризованный тест рендеринга graph режима при разном объёме истории.
 
-    Edge case: С 1 точкой график не рисуется (нужно минимум 2).
+    Edge case: С <2 точками график не рисуется, изображение остаётся пустым.
     """
-    with patch('widgets.disk.psutil') as mock_psutil:
-        mock_psutil.disk_io_counters.return_value = {}
+    widget = DiskWidget(display_mode="graph", history_length=10, max_speed_mbps=100.0, disk_name="sda")
+    widget.set_size(128, 40)
 
-        widget = DiskWidget(display_mode="graph", disk_name="sda")
-        widget.set_size(128, 40)
+    # Добавляем данные в историю одним extend() на каждую deque
+    widget._read_history.extend(float(i * 10 * MB) for i in range(n_points))
+    widget._write_history.extend(float(i * 5 * MB) for i in range(n_points))
 
-        # Только 1 точка
-        widget._read_history.append(100000.0)
-        widget._write_history.append(50000.0)
+    image = widget.render()
 
-        image = widget.render()
-
-        assert image.size == (128, 40)
+    assert image.size == (128, 40)
+    # getbbox() возвращает None для полностью чёрного изображения
+    assert (image.getbbox() is not None) == expect_graph
 
 
 # =============================================================================
 # Тесты get_update_interval
 # =============================================================================
 
-def test_disk_get_update_interval_default() -> None:
+def test_disk_get_update_interval_default(mock_disk_psutil: Mock) -> None:
     """
     Тест get_update_interval возвращает дефолтное значение.
 
     По умолчанию 1.0 секунда.
     """
-    with patch('widgets.disk.psutil') as mock_psutil:
-        mock_psutil.disk_io_counters.return_value = {}
-
-        widget = DiskWidget(disk_name="sda")
-        assert widget.get_update_interval() == 1.0
+    widget = DiskWidget(disk_name="sda")
+    assert widget.get_update_interval() == 1.0
 
 
-def test_disk_get_update_interval_custom() -> None:
+def test_disk_get_update_interval_custom(mock_disk_psutil: Mock) -> None:
     """
     Тест get_update_interval возвращает кастомное значение.
 
     Проверяет установку через update_interval.
     """
-    with patch('widgets.disk.psutil') as mock_psutil:
-        mock_psutil.disk_io_counters.return_value = {}
-
-        widget = DiskWidget(update_interval=0.5, disk_name="sda")
-        assert widget.get_update_interval() == 0.5
+    widget = DiskWidget(update_interval=0.5, disk_name="sda")
+    assert widget.get_update_interval() == 0.5
 
 
 # =============================================================================
 # Тесты edge cases и стилизации
 # =============================================================================
 
-def test_disk_render_with_padding() -> None:
+def test_disk_render_with_padding(mock_disk_psutil: Mock) -> None:
     """
     Тест рендеринга с отступами.
 
     Проверяет параметр padding.
     """
-    with patch('widgets.disk.psutil') as mock_psutil:
-        mock_psutil.disk_io_counters.return_value = {}
+    widget = DiskWidget(padding=10, disk_name="sda")
+    widget.set_size(128, 40)
 
-        widget = DiskWidget(padding=10, disk_name="sda")
-        widget.set_size(128, 40)
-
-        image = widget.render()
+    image = widget.render()
 
-        assert image is not None
+    assert image is not None
 
 
-def test_disk_render_different_sizes() -> None:
+def test_disk_render_different_sizes(mock_disk_psutil: Mock) -> None:
     """
     Тест рендеринга с разными размерами виджета.
 
     Проверяет корректную работу с нестандартными размерами.
     """
-    with patch('widgets.disk.psutil') as mock_psutil:
-        mock_psutil.disk_io_counters.return_value = {}
+    widget = DiskWidget(disk_name="sda")
 
-        widget = DiskWidget(disk_name="sda")
-
-        for size in [(64, 20), (128, 40), (256, 64)]:
-            widget.set_size(*size)
-            image = widget.render()
-            assert image.size == size
+    for size in [(64, 20), (128, 40), (256, 64)]:
+        widget.set_size(*size)
+        image = widget.render()
+        assert image.size == size
 
 
-def test_disk_render_unknown_display_mode() -> None:
+def test_disk_render_unknown_display_mode(mock_disk_psutil: Mock) -> None:
     """
     Тест рендеринга с неизвестным режимом.
 
     Edge case: Должен залогировать предупреждение и вернуть пустое изображение.
     """
-    with patch('widgets.disk.psutil') as mock_psutil:
-        mock_psutil.disk_io_counters.return_value = {}
-
-        widget = DiskWidget(disk_name="sda")
-        widget.display_mode = "invalid_mode"
-        widget.set_size(128, 40)
+    widget = DiskWidget(disk_name="sda")
+    widget.display_mode = "invalid_mode"
+    widget.set_size(128, 40)
 
-        image = widget.render()
+    image = widget.render()
 
-        assert isinstance(image, Image.Image)
+    assert isinstance(image, Image.Image)
 
 
 # =============================================================================
 # Integration тесты
 # =============================================================================
 
-def test_disk_full_workflow() -> None:
+def test_disk_full_workflow(mock_disk_psutil: Mock) -> None:
     """
     Integration тест полного жизненного цикла виджета.
 
     Проверяет init -> update -> render последовательность.
     """
-    with patch('widgets.disk.psutil') as mock_psutil, \
-         patch('time.time') as mock_time:
-
+    with patch('time.monotonic_ns') as mock_time:
         # Инициализация
         widget = DiskWidget(
             name="TestDisk",
@@ -875,19 +768,17 @@ def test_disk_full_workflow() -> None:
         widget.set_size(128, 40)
 
         # Первый update
-        mock_counter1 = Mock()
-        mock_counter1.read_bytes = 1000000
-        mock_counter1.write_bytes = 500000
-        mock_psutil.disk_io_counters.return_value = {"sda": mock_counter1}
-        mock_time.return_value = 100.0
+        mock_counter1 = DiskCounters(read_bytes=1000000, write_bytes=500000)
+        mock_disk_psutil.disk_io_counters.return_value = {"sda": mock_counter1}
+        mock_time.return_value = 100 * NS_PER_SEC
         widget.update()
 
         # Второй update
-        mock_counter2 = Mock()
-        mock_counter2.read_bytes = 11048576  # +10 MB
-        mock_counter2.write_bytes = 5524288   # +5 MB
-        mock_psutil.disk_io_counters.return_value = {"sda": mock_counter2}
-        mock_time.return_value = 101.0
+        # READ: +10 MB
+        # WRITE: +5 MB
+        mock_counter2 = DiskCounters(read_bytes=11048576, write_bytes=5524288)
+        mock_disk_psutil.disk_io_counters.return_value = {"sda": mock_counter2}
+        mock_time.return_value = 101 * NS_PER_SEC
         widget.update()
 
         # Рендеринг
@@ -898,30 +789,29 @@ def test_disk_full_workflow() -> None:
         assert widget._current_write_speed > 0
 
 
-def test_disk_multiple_updates_and_renders() -> None:
+def test_disk_multiple_updates_and_renders(mock_disk_psutil: Mock) -> None:
     """
     Integration тест с несколькими циклами update/render.
 
     Проверяет стабильность при многократных вызовах.
     """
-    with patch('widgets.disk.psutil') as mock_psutil, \
-         patch('time.time') as mock_time:
-
+    with patch('time.monotonic_ns') as mock_time:
         widget = DiskWidget(display_mode="graph", history_length=5, disk_name="sda")
         widget.set_size(128, 40)
 
         # Делаем 5 циклов
-        for i in range(5):
-            mock_counter = Mock()
-            mock_counter.read_bytes = 1000000 + i * 1048576  # +1 MB каждый раз
-            mock_counter.write_bytes = 500000 + i * 524288   # +0.5 MB каждый раз
-            mock_psutil.disk_io_counters.return_value = {"sda": mock_counter}
-            mock_time.return_value = 100.0 + i
+        # Каждый update() получает следующее время: 100, 101, ... секунд
+        mock_time.side_effect = [(100 + i) * NS_PER_SEC for i in range(len(_CYCLE_COUNTERS))]
+
+        for counter in _CYCLE_COUNTERS:
+            mock_disk_psutil.disk_io_counters.return_value = {"sda": counter}
 
             widget.update()
             image = widget.render()
 
             assert isinstance(image, Image.Image)
 
-        # История должна содержать данные
-        assert len(widget._read_history) >= 1
+        # История должна содержать данные и не превышать history_length
+        assert len(widget._read_history) == widget.history_length
+        assert widget._read_history.maxlen == widget.history_length
+        assert widget._write_history.maxlen == widget.history_length
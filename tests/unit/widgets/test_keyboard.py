@@ -18,9 +18,19 @@ Unit tests для widgets.keyboard - виджет индикации состо
 import pytest
 from unittest.mock import Mock, patch
 from PIL import Image
+from utils.bitmap import rasterize_text
 from widgets.keyboard import KeyboardWidget
 
 
+# Смешанные состояния клавиш по виртуальному коду: Caps = ON, Num = OFF, Scroll = ON.
+# Неизвестный код даёт KeyError, так тест заметит запрос лишней клавиши
+_MIXED_KEY_STATES = {
+    KeyboardWidget.VK_CAPITAL: True,
+    KeyboardWidget.VK_NUMLOCK: False,
+    KeyboardWidget.VK_SCROLL: True,
+}
+
+
 # =============================================================================
 # Тесты инициализации
 # =============================================================================
@@ -115,21 +125,31 @@ def test_keyboard_get_key_state_no_support() -> None:
     assert state is False
 
 
-def test_keyboard_get_key_state_logic() -> None:
+@pytest.mark.parametrize("raw_state,expected", [
+    # Бит 0 установлен (нечётные числа) -> True
+    (1, True), (3, True), (5, True), (255, True), (32767, True),
+    (-127, True),  # Клавиша нажата (старший бит SHORT) и включена
+    # Бит 0 не установлен (чётные числа) -> False
+    (0, False), (2, False), (4, False), (254, False), (32766, False),
+    (-128, False),  # Клавиша нажата, но выключена
+])
+@patch('widgets.keyboard.platform.system', return_value="Windows")
+@patch('widgets.keyboard.KEYBOARD_SUPPORT', True)
+def test_keyboard_get_key_state_logic(mock_system: Mock, raw_state: int, expected: bool) -> None:
     """
-    Тест логики битовой маски в _get_key_state.
+    Параметризованный тест логики битовой маски в _get_key_state.
 
-    Проверяет что бит 0 корректно извлекается из разных значений.
+    Проверяет что бит 0 значения GetKeyState корректно извлекается.
     Edge case: Тестируется логика без вызова реального Windows API.
     """
-    # Симулируем логику: bool(state & 1)
-    # Бит 0 установлен (нечётные числа) -> True
-    for value in [1, 3, 5, 255, 32767]:
-        assert bool(value & 1) is True
+    mock_ctypes = Mock()
+    mock_ctypes.windll.user32.GetKeyState.return_value = raw_state
 
-    # Бит 0 не установлен (чётные числа) -> False
-    for value in [0, 2, 4, 254, 32766]:
-        assert bool(value & 1) is False
+    with patch('widgets.keyboard.ctypes', mock_ctypes, create=True):
+        widget = KeyboardWidget()
+        assert widget._get_key_state(widget.VK_CAPITAL) is expected
+
+    mock_ctypes.windll.user32.GetKeyState.assert_called_once_with(widget.VK_CAPITAL)
 
 
 # =============================================================================
@@ -176,16 +196,7 @@ def test_keyboard_update_mixed_states() -> None:
     """
     widget = KeyboardWidget()
 
-    def get_key_state_side_effect(vk_code: int) -> bool:
-        if vk_code == KeyboardWidget.VK_CAPITAL:  # Caps Lock ON
-            return True
-        elif vk_code == KeyboardWidget.VK_NUMLOCK:  # Num Lock OFF
-            return False
-        elif vk_code == KeyboardWidget.VK_SCROLL:  # Scroll Lock ON
-            return True
-        return False
-
-    with patch.object(widget, '_get_key_state', side_effect=get_key_state_side_effect):
+    with patch.object(widget, '_get_key_state', side_effect=_MIXED_KEY_STATES.__getitem__):
         widget.update()
 
         assert widget._caps_lock_state is True
@@ -364,44 +375,47 @@ def test_keyboard_render_with_off_symbols() -> None:
 # Тесты выравнивания
 # =============================================================================
 
-@pytest.mark.parametrize("h_align", ["left", "center", "right"])
-def test_keyboard_render_horizontal_align(h_align: str) -> None:
+@pytest.fixture
+def aligned_keyboard() -> KeyboardWidget:
     """
-    Параметризованный тест горизонтального выравнивания.
+    Виджет 128x40 с двумя включёнными индикаторами для тестов выравнивания.
 
-    Проверяет что индикаторы правильно выравниваются.
+    Тесты меняют только атрибут выравнивания перед render().
+
+    Returns:
+        KeyboardWidget: Настроенный виджет
     """
-    widget = KeyboardWidget(
-        horizontal_align=h_align,
-        caps_lock_on="C",
-        num_lock_on="N"
-    )
+    widget = KeyboardWidget(caps_lock_on="C", num_lock_on="N")
     widget.set_size(128, 40)
     widget._caps_lock_state = True
     widget._num_lock_state = True
+    return widget
 
-    image = widget.render()
+
+@pytest.mark.parametrize("h_align", ["left", "center", "right"])
+def test_keyboard_render_horizontal_align(h_align: str, aligned_keyboard: KeyboardWidget) -> None:
+    """
+    Параметризованный тест горизонтального выравнивания.
+
+    Проверяет что индикаторы правильно выравниваются.
+    """
+    aligned_keyboard.horizontal_align = h_align
+
+    image = aligned_keyboard.render()
 
     assert isinstance(image, Image.Image)
 
 
 @pytest.mark.parametrize("v_align", ["top", "center", "bottom"])
-def test_keyboard_render_vertical_align(v_align: str) -> None:
+def test_keyboard_render_vertical_align(v_align: str, aligned_keyboard: KeyboardWidget) -> None:
     """
     Параметризованный тест вертикального выравнивания.
 
     Проверяет что индикаторы правильно выравниваются.
     """
-    widget = KeyboardWidget(
-        vertical_align=v_align,
-        caps_lock_on="C",
-        num_lock_on="N"
-    )
-    widget.set_size(128, 40)
-    widget._caps_lock_state = True
-    widget._num_lock_state = True
+    aligned_keyboard.vertical_align = v_align
 
-    image = widget.render()
+    image = aligned_keyboard.render()
 
     assert isinstance(image, Image.Image)
 
@@ -602,6 +616,27 @@ def test_keyboard_render_unicode_symbols() -> None:
     assert isinstance(image, Image.Image)
 
 
+def test_keyboard_render_reuses_cached_symbol_masks() -> None:
+    """
+    Тест что повторный рендеринг не растеризует символы индикаторов заново.
+
+    Набор символов виджета фиксирован, маски берутся из кэша rasterize_text.
+    """
+    widget = KeyboardWidget(caps_lock_on="C", num_lock_on="N", scroll_lock_on="S")
+    widget.set_size(128, 40)
+    widget._caps_lock_state = True
+    widget._num_lock_state = True
+    widget._scroll_lock_state = True
+
+    first = widget.render()
+    hits_before = rasterize_text.cache_info().hits
+    second = widget.render()
+
+    assert rasterize_text.cache_info().hits == hits_before + 3
+    assert first.tobytes() == second.tobytes()
+    assert first.getbbox() is not None
+
+
 # =============================================================================
 # Integration тесты
 # =============================================================================
@@ -625,16 +660,7 @@ def test_keyboard_full_workflow() -> None:
     widget.set_size(128, 40)
 
     # Caps = ON, Num = OFF, Scroll = ON
-    def get_key_state_side_effect(vk_code: int) -> bool:
-        if vk_code == KeyboardWidget.VK_CAPITAL:
-            return True
-        elif vk_code == KeyboardWidget.VK_NUMLOCK:
-            return False
-        elif vk_code == KeyboardWidget.VK_SCROLL:
-            return True
-        return False
-
-    with patch.object(widget, '_get_key_state', side_effect=get_key_state_side_effect):
+    with patch.object(widget, '_get_key_state', side_effect=_MIXED_KEY_STATES.__getitem__):
         # Update
         widget.update()
 
@@ -657,15 +683,16 @@ def test_keyboard_multiple_updates_and_renders() -> None:
     widget = KeyboardWidget(caps_lock_on="C")
     widget.set_size(128, 40)
 
-    # Делаем 5 циклов со сменой состояния
-    for i in range(5):
-        # Чередуем ON/OFF
-        state = (i % 2 == 0)
+    # Патчим один раз, в цикле меняем только возвращаемое значение
+    with patch.object(widget, '_get_key_state') as mock_get_state:
+        # Делаем 5 циклов со сменой состояния
+        for i in range(5):
+            # Чередуем ON/OFF
+            state = (i % 2 == 0)
+            mock_get_state.return_value = state
 
-        with patch.object(widget, '_get_key_state', return_value=state):
             widget.update()
+            image = widget.render()
 
-        image = widget.render()
-
-        assert isinstance(image, Image.Image)
-        assert widget._caps_lock_state == state
+            assert isinstance(image, Image.Image)
+            assert widget._caps_lock_state == state
@@ -15,11 +15,20 @@ Unit tests для widgets.network - виджет мониторинга сети
 """
 
 import pytest
-from unittest.mock import patch, Mock
+from collections import namedtuple
+from unittest.mock import patch
 from PIL import Image
 from widgets.network import NetworkWidget
 
 
+# Лёгкая замена результата psutil.net_io_counters() для интерфейса:
+# доступ к полям namedtuple дешевле, чем к атрибутам Mock
+NetIOCounters = namedtuple('NetIOCounters', ['bytes_recv', 'bytes_sent'])
+
+# NetworkWidget измеряет интервалы через time.monotonic_ns()
+NS_PER_SEC = 1_000_000_000
+
+
 # =============================================================================
 # Тесты инициализации
 # =============================================================================
@@ -148,9 +157,7 @@ def test_network_update_first_call_returns_zero() -> None:
     Edge case: При первом вызове нет предыдущих данных, поэтому скорость = 0.
     """
     with patch('widgets.network.psutil') as mock_psutil:
-        mock_stats = Mock()
-        mock_stats.bytes_recv = 1000000
-        mock_stats.bytes_sent = 500000
+        mock_stats = NetIOCounters(bytes_recv=1000000, bytes_sent=500000)
         mock_psutil.net_io_counters.return_value = {"eth0": mock_stats}
 
         widget = NetworkWidget(interface="eth0")
@@ -172,24 +179,23 @@ def test_network_update_calculates_speed() -> None:
     Проверяет формулу: speed = (bytes_delta) / (time_delta)
     """
     with patch('widgets.network.psutil') as mock_psutil, \
-         patch('time.time') as mock_time:
+         patch('time.monotonic_ns') as mock_time:
 
         # Первый вызов
-        mock_stats1 = Mock()
-        mock_stats1.bytes_recv = 1000000
-        mock_stats1.bytes_sent = 500000
+        mock_stats1 = NetIOCounters(bytes_recv=1000000, bytes_sent=500000)
         mock_psutil.net_io_counters.return_value = {"eth0": mock_stats1}
-        mock_time.return_value = 100.0
+        mock_time.return_value = 100 * NS_PER_SEC
 
         widget = NetworkWidget(interface="eth0")
         widget.update()
 
         # Второй вызов через 1 секунду
-        mock_stats2 = Mock()
-        mock_stats2.bytes_recv = 1128000  # +128000 байт (128 KB)
-        mock_stats2.bytes_sent = 564000   # +64000 байт (64 KB)
+        mock_stats2 = NetIOCounters(
+            bytes_recv=1128000,  # +128000 байт (128 KB)
+            bytes_sent=564000,   # +64000 байт (64 KB)
+        )
         mock_psutil.net_io_counters.return_value = {"eth0": mock_stats2}
-        mock_time.return_value = 101.0
+        mock_time.return_value = 101 * NS_PER_SEC
 
         widget.update()
 
@@ -206,7 +212,7 @@ def test_network_update_missing_interface() -> None:
     """
     with patch('widgets.network.psutil') as mock_psutil:
         # Интерфейс eth0 не найден, доступны только wlan0
-        mock_psutil.net_io_counters.return_value = {"wlan0": Mock()}
+        mock_psutil.net_io_counters.return_value = {"wlan0": NetIOCounters(0, 0)}
 
         widget = NetworkWidget(interface="eth0")
         widget.update()
@@ -223,24 +229,23 @@ def test_network_update_negative_delta_clamped() -> None:
     Edge case: Если bytes_recv уменьшился (счётчик обнулён), скорость = 0.
     """
     with patch('widgets.network.psutil') as mock_psutil, \
-         patch('time.time') as mock_time:
+         patch('time.monotonic_ns') as mock_time:
 
         # Первый вызов
-        mock_stats1 = Mock()
-        mock_stats1.bytes_recv = 1000000
-        mock_stats1.bytes_sent = 500000
+        mock_stats1 = NetIOCounters(bytes_recv=1000000, bytes_sent=500000)
         mock_psutil.net_io_counters.return_value = {"eth0": mock_stats1}
-        mock_time.return_value = 100.0
+        mock_time.return_value = 100 * NS_PER_SEC
 
         widget = NetworkWidget(interface="eth0")
         widget.update()
 
         # Второй вызов - счётчик обнулён
-        mock_stats2 = Mock()
-        mock_stats2.bytes_recv = 100  # Меньше чем было
-        mock_stats2.bytes_sent = 50
+        mock_stats2 = NetIOCounters(
+            bytes_recv=100,  # Меньше чем было
+            bytes_sent=50,
+        )
         mock_psutil.net_io_counters.return_value = {"eth0": mock_stats2}
-        mock_time.return_value = 101.0
+        mock_time.return_value = 101 * NS_PER_SEC
 
         widget.update()
 
@@ -256,14 +261,12 @@ def test_network_update_zero_time_delta() -> None:
     Edge case: Деление на 0 должно быть обработано.
     """
     with patch('widgets.network.psutil') as mock_psutil, \
-         patch('time.time') as mock_time:
+         patch('time.monotonic_ns') as mock_time:
 
         # Оба вызова в одно и то же время
-        mock_stats = Mock()
-        mock_stats.bytes_recv = 1000000
-        mock_stats.bytes_sent = 500000
+        mock_stats = NetIOCounters(bytes_recv=1000000, bytes_sent=500000)
         mock_psutil.net_io_counters.return_value = {"eth0": mock_stats}
-        mock_time.return_value = 100.0
+        mock_time.return_value = 100 * NS_PER_SEC
 
         widget = NetworkWidget(interface="eth0")
         widget.update()
@@ -285,24 +288,20 @@ def test_network_update_graph_mode_adds_to_history() -> None:
     Проверяет добавление в _rx_history и _tx_history.
     """
     with patch('widgets.network.psutil') as mock_psutil, \
-         patch('time.time') as mock_time:
+         patch('time.monotonic_ns') as mock_time:
 
         widget = NetworkWidget(display_mode="graph", history_length=10, interface="eth0")
 
         # Первый update
-        mock_stats1 = Mock()
-        mock_stats1.bytes_recv = 1000000
-        mock_stats1.bytes_sent = 500000
+        mock_stats1 = NetIOCounters(bytes_recv=1000000, bytes_sent=500000)
         mock_psutil.net_io_counters.return_value = {"eth0": mock_stats1}
-        mock_time.return_value = 100.0
+        mock_time.return_value = 100 * NS_PER_SEC
         widget.update()
 
         # Второй update
-        mock_stats2 = Mock()
-        mock_stats2.bytes_recv = 1128000
-        mock_stats2.bytes_sent = 564000
+        mock_stats2 = NetIOCounters(bytes_recv=1128000, bytes_sent=564000)
         mock_psutil.net_io_counters.return_value = {"eth0": mock_stats2}
-        mock_time.return_value = 101.0
+        mock_time.return_value = 101 * NS_PER_SEC
         widget.update()
 
         assert len(widget._rx_history) == 2  # Оба update добавляют (первый = 0.0, второй = реальная скорость)
@@ -320,17 +319,17 @@ def test_network_update_graph_mode_respects_max_length() -> None:
     Edge case: Старые значения вытесняются новыми.
     """
     with patch('widgets.network.psutil') as mock_psutil, \
-         patch('time.time') as mock_time:
+         patch('time.monotonic_ns') as mock_time:
 
         widget = NetworkWidget(display_mode="graph", history_length=3, interface="eth0")
 
+        # Каждый update() получает следующее время: 100, 101, ... секунд
+        mock_time.side_effect = [(100 + i) * NS_PER_SEC for i in range(5)]
+
         # Делаем 5 обновлений
         for i in range(5):
-            mock_stats = Mock()
-            mock_stats.bytes_recv = 1000000 + i * 100000
-            mock_stats.bytes_sent = 500000 + i * 50000
+            mock_stats = NetIOCounters(bytes_recv=1000000 + i * 100000, bytes_sent=500000 + i * 50000)
             mock_psutil.net_io_counters.return_value = {"eth0": mock_stats}
-            mock_time.return_value = 100.0 + i
             widget.update()
 
         # История должна содержать только последние 3 значения
@@ -345,17 +344,17 @@ def test_network_update_non_graph_mode_no_history() -> None:
     В bar/text режимах _rx_history и _tx_history должны быть пустыми.
     """
     with patch('widgets.network.psutil') as mock_psutil, \
-         patch('time.time') as mock_time:
+         patch('time.monotonic_ns') as mock_time:
 
         widget = NetworkWidget(display_mode="bar_horizontal", interface="eth0")
 
+        # Каждый update() получает следующее время: 100, 101, ... секунд
+        mock_time.side_effect = [(100 + i) * NS_PER_SEC for i in range(3)]
+
         # Несколько обновлений
         for i in range(3):
-            mock_stats = Mock()
-            mock_stats.bytes_recv = 1000000 + i * 100000
-            mock_stats.bytes_sent = 500000 + i * 50000
+            mock_stats = NetIOCounters(bytes_recv=1000000 + i * 100000, bytes_sent=500000 + i * 50000)
             mock_psutil.net_io_counters.return_value = {"eth0": mock_stats}
-            mock_time.return_value = 100.0 + i
             widget.update()
 
         assert len(widget._rx_history) == 0
@@ -443,6 +442,25 @@ def test_network_get_speed_percentage_dynamic_scaling() -> None:
         assert percentage == pytest.approx(50.0, abs=0.1)
 
 
+def test_network_get_speed_percentage_with_precomputed_max_speed() -> None:
+    """
+    Тест что переданный max_speed даёт тот же результат, что и вычисленный.
+
+    График вычисляет масштаб (проход по истории) один раз и передаёт его для каждой точки.
+    """
+    with patch('widgets.network.psutil'):
+        widget = NetworkWidget(max_speed_mbps=-1.0, display_mode="graph")
+        widget._rx_history.extend([100000.0, 200000.0])
+        widget._tx_history.extend([50000.0, 300000.0])
+
+        max_speed = widget._get_max_speed()
+        assert max_speed == 300000.0
+
+        for speed in (0.0, 75000.0, 300000.0):
+            assert widget._get_speed_percentage(speed, max_speed=max_speed) == \
+                widget._get_speed_percentage(speed)
+
+
 def test_network_get_speed_percentage_over_100() -> None:
     """
     Тест что процент ограничен 100%.
@@ -488,9 +506,7 @@ def test_network_render_calls_update_if_needed() -> None:
     При первом render() должен автоматически обновить данные.
     """
     with patch('widgets.network.psutil') as mock_psutil:
-        mock_stats = Mock()
-        mock_stats.bytes_recv = 1000000
-        mock_stats.bytes_sent = 500000
+        mock_stats = NetIOCounters(bytes_recv=1000000, bytes_sent=500000)
         mock_psutil.net_io_counters.return_value = {"eth0": mock_stats}
 
         widget = NetworkWidget(interface="eth0")
@@ -825,7 +841,7 @@ def test_network_full_workflow() -> None:
     Проверяет init -> update -> render последовательность.
     """
     with patch('widgets.network.psutil') as mock_psutil, \
-         patch('time.time') as mock_time:
+         patch('time.monotonic_ns') as mock_time:
 
         # Инициализация
         widget = NetworkWidget(
@@ -837,19 +853,15 @@ def test_network_full_workflow() -> None:
         widget.set_size(128, 40)
 
         # Первый update
-        mock_stats1 = Mock()
-        mock_stats1.bytes_recv = 1000000
-        mock_stats1.bytes_sent = 500000
+        mock_stats1 = NetIOCounters(bytes_recv=1000000, bytes_sent=500000)
         mock_psutil.net_io_counters.return_value = {"eth0": mock_stats1}
-        mock_time.return_value = 100.0
+        mock_time.return_value = 100 * NS_PER_SEC
         widget.update()
 
         # Второй update
-        mock_stats2 = Mock()
-        mock_stats2.bytes_recv = 1128000
-        mock_stats2.bytes_sent = 564000
+        mock_stats2 = NetIOCounters(bytes_recv=1128000, bytes_sent=564000)
         mock_psutil.net_io_counters.return_value = {"eth0": mock_stats2}
-        mock_time.return_value = 101.0
+        mock_time.return_value = 101 * NS_PER_SEC
         widget.update()
 
         # Рендеринг
@@ -867,18 +879,18 @@ def test_network_multiple_updates_and_renders() -> None:
     Проверяет стабильность при многократных вызовах.
     """
     with patch('widgets.network.psutil') as mock_psutil, \
-         patch('time.time') as mock_time:
+         patch('time.monotonic_ns') as mock_time:
 
         widget = NetworkWidget(display_mode="graph", history_length=5, interface="eth0")
         widget.set_size(128, 40)
 
+        # Каждый update() получает следующее время: 100, 101, ... секунд
+        mock_time.side_effect = [(100 + i) * NS_PER_SEC for i in range(5)]
+
         # Делаем 5 циклов
         for i in range(5):
-            mock_stats = Mock()
-            mock_stats.bytes_recv = 1000000 + i * 100000
-            mock_stats.bytes_sent = 500000 + i * 50000
+            mock_stats = NetIOCounters(bytes_recv=1000000 + i * 100000, bytes_sent=500000 + i * 50000)
             mock_psutil.net_io_counters.return_value = {"eth0": mock_stats}
-            mock_time.return_value = 100.0 + i
 
             widget.update()
             image = widget.render()
@@ -896,7 +908,7 @@ def test_network_realistic_usage_patterns() -> None:
     Симулирует скачивание файла с переменной скоростью.
     """
     with patch('widgets.network.psutil') as mock_psutil, \
-         patch('time.time') as mock_time:
+         patch('time.monotonic_ns') as mock_time:
 
         # RX скорости в KB/s: 100, 500, 1000, 2000, 1500, 800, 300, 100
         rx_speeds_kb = [100, 500, 1000, 2000, 1500, 800, 300, 100]
@@ -907,16 +919,16 @@ def test_network_realistic_usage_patterns() -> None:
         bytes_recv = 0
         bytes_sent = 0
 
-        for i, speed_kb in enumerate(rx_speeds_kb):
+        # Каждый update() получает следующее время: 100, 101, ... секунд
+        mock_time.side_effect = [(100 + i) * NS_PER_SEC for i in range(len(rx_speeds_kb))]
+
+        for speed_kb in rx_speeds_kb:
             # Увеличиваем счётчики
             bytes_recv += int(speed_kb * 1024)  # KB -> bytes
             bytes_sent += int(speed_kb * 102)   # 10% от RX
 
-            mock_stats = Mock()
-            mock_stats.bytes_recv = bytes_recv
-            mock_stats.bytes_sent = bytes_sent
+            mock_stats = NetIOCounters(bytes_recv=bytes_recv, bytes_sent=bytes_sent)
             mock_psutil.net_io_counters.return_value = {"eth0": mock_stats}
-            mock_time.return_value = 100.0 + i
 
             widget.update()
 
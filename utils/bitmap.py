@@ -3,6 +3,7 @@
 Конвертация PIL Image в формат GameSense API.
 """
 
+import functools
 import os
 import logging
 from pathlib import Path
@@ -202,6 +203,81 @@ def load_font(font: Optional[str] = None, size: int = 10) -> ImageFont.FreeTypeF
     return ImageFont.load_default()
 
 
+@functools.lru_cache(maxsize=32)
+def get_font(font: Optional[str] = None, size: int = 10) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
+    """
+    Возвращает шрифт из кэша, загружая его через load_font при первом обращении.
+
+    Поиск файла и разбор TTF через FreeType выполняются один раз для каждой пары
+    (font, size), все виджеты и функции рисования используют общий объект шрифта.
+
+    Args:
+        font: Имя шрифта или путь к файлу (None = default font)
+        size: Размер шрифта
+
+    Returns:
+        ImageFont: Загруженный шрифт или default font
+    """
+    return load_font(font, size)
+
+
+def text_bbox(
+        text: str,
+        font_obj: ImageFont.FreeTypeFont | ImageFont.ImageFont
+) -> Tuple[int, int, int, int]:
+    """
+    Вычисляет границы текста так же, как ImageDraw.textbbox.
+
+    Текст с переводами строк измеряется через multiline_textbbox (все строки),
+    однострочный текст - напрямую через шрифт, без временного изображения.
+
+    Args:
+        text: Текст для измерения
+        font_obj: Загруженный шрифт
+
+    Returns:
+        Tuple[int, int, int, int]: (left, top, right, bottom)
+    """
+    if "\n" in text:
+        bbox = ImageDraw.Draw(Image.new('L', (1, 1))).multiline_textbbox((0, 0), text, font=font_obj)
+    else:
+        bbox = font_obj.getbbox(text)
+    left, top, right, bottom = map(int, bbox)
+    return left, top, right, bottom
+
+
+@functools.lru_cache(maxsize=512)
+def rasterize_text(
+        text: str,
+        font: Optional[str] = None,
+        font_size: int = 10
+) -> Tuple[Image.Image, Tuple[int, int]]:
+    """
+    Растеризует текст в маску (режим 'L') минимального размера.
+
+    Результат кэшируется: повторный рендеринг той же строки тем же шрифтом
+    сводится к одному Image.paste вместо повторной растеризации через FreeType.
+    Маска не зависит от цвета, цвет применяется при вставке.
+    Маска общая для всех вызывающих, изменять её нельзя.
+
+    Args:
+        text: Текст для растеризации
+        font: Имя шрифта или путь к файлу (None = default)
+        font_size: Размер шрифта
+
+    Returns:
+        Tuple[Image.Image, Tuple[int, int]]: (маска, смещение маски относительно точки
+            отрисовки текста). Размер маски совпадает с размером textbbox.
+    """
+    font_obj = get_font(font, font_size)
+
+    left, top, right, bottom = text_bbox(text, font_obj)
+    mask = Image.new('L', (max(right - left, 0), max(bottom - top, 0)))
+    ImageDraw.Draw(mask).text((-left, -top), text, fill=255, font=font_obj)
+
+    return mask, (left, top)
+
+
 def image_to_bytes(image: Image.Image, width: int = 128, height: int = 40) -> List[int]:
     """
     Конвертирует PIL Image в массив байтов для GameSense API.
@@ -291,7 +367,7 @@ def draw_text(
         font: Имя шрифта или путь к файлу (None = default)
     """
     draw = ImageDraw.Draw(image)
-    font_obj = load_font(font, font_size)
+    font_obj = get_font(font, font_size)
     draw.text(position, text, fill=color, font=font_obj)
 
 
@@ -315,7 +391,7 @@ def draw_centered_text(
         font: Имя шрифта или путь к файлу (None = default)
     """
     draw = ImageDraw.Draw(image)
-    font_obj = load_font(font, font_size)
+    font_obj = get_font(font, font_size)
 
     # Получаем размер текста
     bbox = draw.textbbox((0, 0), text, font=font_obj)
@@ -352,13 +428,15 @@ def draw_aligned_text(
         vertical_align: Вертикальное выравнивание ("top", "center", "bottom")
         padding: Отступ от краёв в пикселях
     """
-    draw = ImageDraw.Draw(image)
-    font_obj = load_font(font, font_size)
+    if not text:
+        return
 
-    # Получаем размер текста
-    bbox = draw.textbbox((0, 0), text, font=font_obj)
-    text_width = bbox[2] - bbox[0]
-    text_height = bbox[3] - bbox[1]
+    # Маска из кэша: при неизменном тексте (например, часы между сменами секунд)
+    # FreeType не вызывается, остаётся только вставка готовой маски
+    mask, (offset_x, offset_y) = rasterize_text(text, font, font_size)
+
+    # Размер маски равен размеру текста
+    text_width, text_height = mask.size
 
     # Вычисляем X координату
     if horizontal_align == "left":
@@ -376,7 +454,7 @@ def draw_aligned_text(
     else:  # center
         y = (image.height - text_height) // 2
 
-    draw.text((x, y), text, fill=color, font=font_obj)
+    image.paste(color, (x + offset_x, y + offset_y), mask)
 
 
 def draw_progress_bar(
@@ -416,6 +494,27 @@ def draw_progress_bar(
             )
 
 
+def graph_x_coords(count: int, history_length: int, content_x: int, content_w: int) -> List[int]:
+    """
+    Вычисляет X координаты точек графика истории.
+
+    Новые данные всегда появляются справа: при неполной истории точки
+    смещаются так, чтобы последняя была у правого края.
+
+    Args:
+        count: Количество образцов в истории
+        history_length: Максимальная длина истории
+        content_x: Левая граница области графика
+        content_w: Ширина области графика
+
+    Returns:
+        List[int]: X координата для каждого образца истории
+    """
+    offset = history_length - count
+    divisor = max(history_length - 1, 1)
+    return [content_x + int((offset + i) / divisor * content_w) for i in range(count)]
+
+
 def test_bitmap_conversion() -> List[int]:
     """
     Тестовая функция для проверки конвертации bitmap.
@@ -4,11 +4,12 @@
 Общий модуль для всех виджетов с текстовым режимом отображения.
 """
 
+import functools
 import logging
 from typing import List, Optional, Tuple
-from PIL import Image, ImageDraw
+from PIL import Image
 
-from utils.bitmap import Color, load_font, to_pil_color
+from utils.bitmap import Color, get_font, rasterize_text, text_bbox
 
 logger = logging.getLogger(__name__)
 
@@ -36,8 +37,10 @@ def render_single_line_text(
         vertical_align: Вертикальное выравнивание ("top", "center", "bottom")
         padding: Отступ от краёв в пикселях
     """
-    draw = ImageDraw.Draw(image)
-    font_obj = load_font(font, font_size)
+    if not text:
+        return
+
+    mask, (offset_x, offset_y) = rasterize_text(text, font, font_size)
 
     # Вычисляем доступное пространство
     content_x = padding
@@ -45,10 +48,8 @@ def render_single_line_text(
     content_w = image.width - padding * 2
     content_h = image.height - padding * 2
 
-    # Получаем размер текста
-    bbox = draw.textbbox((0, 0), text, font=font_obj)
-    text_w = bbox[2] - bbox[0]
-    text_h = bbox[3] - bbox[1]
+    # Размер маски равен размеру текста
+    text_w, text_h = mask.size
 
     # Вычисляем X координату
     if horizontal_align == "left":
@@ -68,7 +69,7 @@ def render_single_line_text(
 
     # Текст всегда непрозрачный (полная видимость)
     text_color: Color = (color, 255) if image.mode == 'LA' else color
-    draw.text((x, y), text, fill=to_pil_color(text_color), font=font_obj)
+    image.paste(text_color, (x + offset_x, y + offset_y), mask)
 
 
 def render_multi_line_text(
@@ -100,29 +101,18 @@ def render_multi_line_text(
     if not lines:
         return
 
-    draw = ImageDraw.Draw(image)
-    font_obj = load_font(font, font_size)
-
     # Вычисляем доступное пространство
     content_x = padding
     content_y = padding
     content_w = image.width - padding * 2
     content_h = image.height - padding * 2
 
-    # Вычисляем размеры каждой строки
-    line_metrics = []
-    max_width = 0
-    total_height = 0
-
-    for i, (text, _) in enumerate(lines):
-        bbox = draw.textbbox((0, 0), text, font=font_obj)
-        width = bbox[2] - bbox[0]
-        height = bbox[3] - bbox[1]
-        line_metrics.append((width, height))
-        max_width = max(max_width, width)
-        total_height += height
-        if i < len(lines) - 1:
-            total_height += line_spacing
+    # Раскладываем строки на параллельные последовательности текстов и цветов
+    texts, colors = zip(*lines)
+
+    # Растеризуем каждую строку (размер маски равен размеру текста)
+    rasterized = [rasterize_text(text, font, font_size) for text in texts]
+    total_height = sum(mask.height for mask, _ in rasterized) + line_spacing * (len(lines) - 1)
 
     # Вычисляем вертикальное положение блока
     if vertical_align == "top":
@@ -134,7 +124,9 @@ def render_multi_line_text(
 
     # Рендерим каждую строку
     current_y = block_y
-    for (text, color), (width, height) in zip(lines, line_metrics):
+    for text, color, (mask, (offset_x, offset_y)) in zip(texts, colors, rasterized):
+        width, height = mask.size
+
         # Вычисляем горизонтальное положение строки
         if horizontal_align == "left":
             x = content_x
@@ -144,11 +136,70 @@ def render_multi_line_text(
             x = content_x + (content_w - width) // 2
 
         # Текст всегда непрозрачный (полная видимость)
-        text_color: Color = (color, 255) if image.mode == 'LA' else color
-        draw.text((x, current_y), text, fill=to_pil_color(text_color), font=font_obj)
+        if text:
+            text_color: Color = (color, 255) if image.mode == 'LA' else color
+            image.paste(text_color, (x + offset_x, current_y + offset_y), mask)
         current_y += height + line_spacing
 
 
+@functools.lru_cache(maxsize=64)
+def _grid_shape(count: int) -> Tuple[int, int]:
+    """
+    Определяет количество строк и столбцов для оптимального размещения значений.
+
+    Args:
+        count: Количество ячеек
+
+    Returns:
+        Tuple[int, int]: (строки, столбцы)
+    """
+    cols = int((count ** 0.5) + 0.5)
+    rows = (count + cols - 1) // cols
+    return rows, cols
+
+
+@functools.lru_cache(maxsize=64)
+def _compute_grid_layout(
+    count: int,
+    width: int,
+    height: int,
+    padding: int
+) -> Tuple[int, int, Tuple[Tuple[int, int], ...]]:
+    """
+    Вычисляет геометрию сетки для render_grid_text.
+
+    Геометрия зависит только от количества значений и размеров области,
+    поэтому вычисляется один раз и кэшируется.
+
+    Args:
+        count: Количество ячеек
+        width: Ширина изображения
+        height: Высота изображения
+        padding: Отступ от краёв в пикселях
+
+    Returns:
+        Tuple: (ширина ячейки, высота ячейки, координаты (x, y) левого верхнего угла
+            каждой ячейки в порядке заполнения по строкам)
+    """
+    # Вычисляем доступное пространство
+    content_x = padding
+    content_y = padding
+    content_w = width - padding * 2
+    content_h = height - padding * 2
+
+    rows, cols = _grid_shape(count)
+
+    cell_w = content_w // cols
+    cell_h = content_h // rows
+
+    cells = tuple(
+        (content_x + (i % cols) * cell_w, content_y + (i // cols) * cell_h)
+        for i in range(count)
+    )
+
+    return cell_w, cell_h, cells
+
+
 def render_grid_text(
     image: Image.Image,
     values: List[float],
@@ -175,47 +226,25 @@ def render_grid_text(
     if not values:
         return
 
-    draw = ImageDraw.Draw(image)
-    font_obj = load_font(font, font_size)
-
-    # Вычисляем доступное пространство
-    content_x = padding
-    content_y = padding
-    content_w = image.width - padding * 2
-    content_h = image.height - padding * 2
+    cell_w, cell_h, cells = _compute_grid_layout(len(values), image.width, image.height, padding)
 
-    # Определяем количество строк и столбцов для оптимального размещения
-    count = len(values)
-    cols = int((count ** 0.5) + 0.5)
-    rows = (count + cols - 1) // cols
+    # Форматируем все значения заранее, спецификация формата разбирается один раз
+    spec = f".{decimal_places}f"
+    texts = [format(value, spec) for value in values]
 
-    cell_w = content_w // cols
-    cell_h = content_h // rows
+    # Текст всегда непрозрачный (полная видимость)
+    text_color: Color = (color, 255) if image.mode == 'LA' else color
 
     # Рендерим каждое значение
-    for i, value in enumerate(values):
-        col = i % cols
-        row = i // cols
-
-        # Форматируем текст
-        if decimal_places == 0:
-            text = f"{value:.0f}"
-        else:
-            text = f"{value:.{decimal_places}f}"
-
-        cell_x = content_x + col * cell_w
-        cell_y = content_y + row * cell_h
+    for text, (cell_x, cell_y) in zip(texts, cells):
+        mask, (offset_x, offset_y) = rasterize_text(text, font, font_size)
 
         # Центрируем текст в ячейке
-        bbox = draw.textbbox((0, 0), text, font=font_obj)
-        text_w = bbox[2] - bbox[0]
-        text_h = bbox[3] - bbox[1]
+        text_w, text_h = mask.size
         x = cell_x + (cell_w - text_w) // 2
         y = cell_y + (cell_h - text_h) // 2
 
-        # Текст всегда непрозрачный (полная видимость)
-        text_color: Color = (color, 255) if image.mode == 'LA' else color
-        draw.text((x, y), text, fill=to_pil_color(text_color), font=font_obj)
+        image.paste(text_color, (x + offset_x, y + offset_y), mask)
 
 
 def measure_text_size(
@@ -234,15 +263,13 @@ def measure_text_size(
     Returns:
         Tuple[int, int]: (ширина, высота) текста в пикселях
     """
-    from PIL import Image, ImageDraw
+    # Пустая строка не имеет размера, шрифт загружать не нужно
+    if not text:
+        return 0, 0
 
-    # Создаём временное изображение для измерения
-    temp_img = Image.new('L', (1, 1))
-    draw = ImageDraw.Draw(temp_img)
-    font_obj = load_font(font, font_size)
+    font_obj = get_font(font, font_size)
 
-    bbox = draw.textbbox((0, 0), text, font=font_obj)
-    width = bbox[2] - bbox[0]
-    height = bbox[3] - bbox[1]
+    # Однострочный текст измеряется напрямую через шрифт, многострочный - по всем строкам
+    left, top, right, bottom = text_bbox(text, font_obj)
 
-    return width, height
+    return right - left, bottom - top
@@ -2,8 +2,10 @@
 Clock Widget - отображает текущее время на дисплее с поддержкой стилизации.
 """
 
+import functools
 import logging
-from typing import Optional
+import re
+from typing import Callable, Dict, Optional, Tuple
 from datetime import datetime
 from PIL import Image, ImageDraw
 
@@ -12,6 +14,39 @@ from utils.bitmap import Color, create_blank_image, draw_aligned_text, to_pil_co
 
 logger = logging.getLogger(__name__)
 
+# Быстрые форматтеры для самых частых форматов времени: сборка строки из полей
+# datetime в несколько раз быстрее strftime. Результат совпадает со strftime
+_FAST_FORMATTERS: Dict[str, Callable[[datetime], str]] = {
+    "%H:%M": lambda dt: f"{dt.hour:02d}:{dt.minute:02d}",
+    "%H:%M:%S": lambda dt: f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}",
+}
+
+# Директивы strftime, результат которых не меняется в пределах минуты
+_MINUTE_DIRECTIVES = frozenset("aAbBdhHIjmMpuUVwWgGyY%")
+
+
+@functools.lru_cache(maxsize=32)
+def _format_resolution(format_string: str) -> Optional[str]:
+    """
+    Определяет, как часто меняется результат форматирования.
+
+    Анализ выполняется один раз для каждой строки формата.
+
+    Args:
+        format_string: Формат даты/времени (strftime format)
+
+    Returns:
+        Optional[str]: "minute" если формат содержит только директивы не точнее минуты,
+            "second" для остальных форматов, None если формат содержит доли секунды (%f)
+            и результат кэшировать нельзя
+    """
+    directives = re.findall(r"%(.)", format_string)
+    if "f" in directives:
+        return None
+    if all(directive in _MINUTE_DIRECTIVES for directive in directives):
+        return "minute"
+    return "second"
+
 
 class ClockWidget(Widget):
     """
@@ -83,6 +118,11 @@ class ClockWidget(Widget):
         self._current_time: Optional[datetime] = None
         self._formatted_time: str = ""
 
+        # Ключ последнего форматирования: (год, месяц, день, час, минута, секунда, формат).
+        # Повторные update() в пределах той же секунды (минуты для форматов без секунд)
+        # не вызывают strftime
+        self._format_cache_key: Optional[Tuple[object, ...]] = None
+
         logger.info(
             f"ClockWidget initialized: {name}, format='{format_string}', "
             f"interval={update_interval}s, font_size={font_size}, font={font or 'default'}, "
@@ -92,12 +132,32 @@ class ClockWidget(Widget):
     def update(self) -> None:
         """Обновляет текущее время."""
         try:
-            self._current_time = datetime.now()
-            self._formatted_time = self._current_time.strftime(self.format_string)
+            now = datetime.now()
+            self._current_time = now
+
+            # Результат не меняется в пределах секунды (или минуты для форматов без секунд).
+            # Доли секунды (%f) меняются при каждом вызове, такой формат не кэшируем
+            resolution = _format_resolution(self.format_string)
+            if resolution is not None:
+                # Кортеж полей заметно дешевле now.replace(microsecond=0)
+                second = now.second if resolution == "second" else 0
+                cache_key = (now.year, now.month, now.day, now.hour, now.minute, second, self.format_string)
+                if cache_key == self._format_cache_key:
+                    return
+            else:
+                cache_key = None
+
+            fast_formatter = _FAST_FORMATTERS.get(self.format_string)
+            if fast_formatter is not None:
+                self._formatted_time = fast_formatter(now)
+            else:
+                self._formatted_time = now.strftime(self.format_string)
+            self._format_cache_key = cache_key
             logger.debug(f"Clock updated: {self._formatted_time}")
         except Exception as e:
             logger.error(f"Failed to update clock: {e}")
             self._formatted_time = "ERROR"
+            self._format_cache_key = None
 
     def render(self) -> Image.Image:
         """
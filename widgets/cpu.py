@@ -13,7 +13,7 @@ except ImportError:
     psutil = None
 
 from core.widget import Widget
-from utils.bitmap import Color, create_blank_image, to_pil_color
+from utils.bitmap import Color, create_blank_image, graph_x_coords, to_pil_color
 from utils.text_renderer import render_single_line_text, render_grid_text
 
 logger = logging.getLogger(__name__)
@@ -257,44 +257,43 @@ class CPUWidget(Widget):
                                f"Consider using aggregate mode or larger widget height.")
                 self._warned_bar_height = True
 
+            # Высота бара и цвет одинаковы для всех ядер, вычисляем их один раз
+            bar_h = int(bar_height)
+            if bar_h <= 0:
+                return
+            pil_fill_color = to_pil_color(fill_color)
+            inner_w = content_w - 2 if self.bar_border else content_w
+            logger.debug(f"Bar 0: usage={self._current_usage[0]:.1f}%, "
+                         f"fill_w={int(inner_w * (self._current_usage[0] / 100.0))}/{inner_w}")
+
             y: float = content_y
 
-            for i, usage in enumerate(self._current_usage):
+            for usage in self._current_usage:
                 bar_y = int(y)
-                bar_h = int(bar_height)
+                fill_w = int(inner_w * (usage / 100.0))
 
-                if bar_h > 0:
-                    # Рисуем рамку бара если нужно
-                    if self.bar_border:
+                if self.bar_border:
+                    # Рамка бара и заполнение внутри рамки
+                    draw.rectangle(
+                        (content_x, bar_y, content_x + content_w - 1, bar_y + bar_h - 1),
+                        outline=pil_fill_color,
+                        fill=None
+                    )
+                    if fill_w > 0:
                         draw.rectangle(
-                            (content_x, bar_y, content_x + content_w - 1, bar_y + bar_h - 1),
-                            outline=to_pil_color(fill_color),
-                            fill=None
+                            (content_x + 1, bar_y + 1, content_x + fill_w, bar_y + bar_h - 2),
+                            fill=pil_fill_color
                         )
-                        # Заполнение внутри рамки
-                        fill_w = int((content_w - 2) * (usage / 100.0))
-                        if i == 0:  # Log first bar for debugging
-                            logger.debug(f"Bar {i}: usage={usage:.1f}%, fill_w={fill_w}/{content_w - 2}")
-                        if fill_w > 0:
-                            draw.rectangle(
-                                (content_x + 1, bar_y + 1, content_x + fill_w, bar_y + bar_h - 2),
-                                fill=to_pil_color(fill_color)
-                            )
-                    else:
-                        # Заполнение без рамки
-                        fill_w = int(content_w * (usage / 100.0))
-                        if i == 0:  # Log first bar for debugging
-                            logger.debug(f"Bar {i}: usage={usage:.1f}%, fill_w={fill_w}/{content_w}")
-                        if fill_w > 0:
-                            draw.rectangle(
-                                (content_x, bar_y, content_x + fill_w - 1, bar_y + bar_h - 1),
-                                fill=to_pil_color(fill_color)
-                            )
-
-                # Переходим к следующему бару
+                elif fill_w > 0:
+                    # Заполнение без рамки
+                    draw.rectangle(
+                        (content_x, bar_y, content_x + fill_w - 1, bar_y + bar_h - 1),
+                        fill=pil_fill_color
+                    )
+
+                # Переходим к следующему бару (отступ после последнего не влияет на отрисовку)
                 y += bar_height
-                if i < cores_count - 1:
-                    y += self.bar_margin
+                y += self.bar_margin
         else:
             # Агрегированный: один горизонтальный бар на всю ширину
             assert isinstance(self._current_usage, float)
@@ -345,42 +344,45 @@ class CPUWidget(Widget):
                 return
 
             bar_width = available_w / cores_count
+
+            # Ширина бара и цвет одинаковы для всех ядер, вычисляем их один раз
+            bar_w = int(bar_width)
+            if bar_w <= 0:
+                return
+            pil_fill_color = to_pil_color(fill_color)
+            bottom_y = content_y + content_h - 1
+
             x: float = content_x
 
-            for i, usage in enumerate(self._current_usage):
+            for usage in self._current_usage:
                 bar_x = int(x)
-                bar_w = int(bar_width)
 
-                if bar_w > 0:
-                    # Вычисляем заполнение снизу вверх
-                    fill_h = int(content_h * (usage / 100.0))
-                    fill_y = content_y + content_h - fill_h
+                # Вычисляем заполнение снизу вверх
+                fill_h = int(content_h * (usage / 100.0))
+                fill_y = content_y + content_h - fill_h
 
-                    # Рисуем рамку бара если нужно
-                    if self.bar_border:
+                if self.bar_border:
+                    # Рамка бара и заполнение внутри рамки (снизу вверх)
+                    draw.rectangle(
+                        (bar_x, content_y, bar_x + bar_w - 1, bottom_y),
+                        outline=pil_fill_color,
+                        fill=None
+                    )
+                    if fill_h > 2:
                         draw.rectangle(
-                            (bar_x, content_y, bar_x + bar_w - 1, content_y + content_h - 1),
-                            outline=to_pil_color(fill_color),
-                            fill=None
+                            (bar_x + 1, max(fill_y, content_y + 1), bar_x + bar_w - 2, bottom_y - 1),
+                            fill=pil_fill_color
                         )
-                        # Заполнение внутри рамки (снизу вверх)
-                        if fill_h > 2:
-                            draw.rectangle(
-                                (bar_x + 1, max(fill_y, content_y + 1), bar_x + bar_w - 2, content_y + content_h - 2),
-                                fill=to_pil_color(fill_color)
-                            )
-                    else:
-                        # Заполнение без рамки (снизу вверх)
-                        if fill_h > 0:
-                            draw.rectangle(
-                                (bar_x, fill_y, bar_x + bar_w - 1, content_y + content_h - 1),
-                                fill=to_pil_color(fill_color)
-                            )
-
-                # Переходим к следующему бару
+                elif fill_h > 0:
+                    # Заполнение без рамки (снизу вверх)
+                    draw.rectangle(
+                        (bar_x, fill_y, bar_x + bar_w - 1, bottom_y),
+                        fill=pil_fill_color
+                    )
+
+                # Переходим к следующему бару (отступ после последнего не влияет на отрисовку)
                 x += bar_width
-                if i < cores_count - 1:
-                    x += self.bar_margin
+                x += self.bar_margin
         else:
             # Агрегированный: один вертикальный бар на всю высоту
             assert isinstance(self._current_usage, float)
@@ -445,6 +447,11 @@ class CPUWidget(Widget):
                                f"Consider using aggregate mode, fewer cores display, or larger widget height.")
                 self._warned_graph_height = True
 
+            # X координаты точек одинаковы для всех ядер, вычисляем их один раз
+            xs = graph_x_coords(len(self._usage_history), self.history_length, content_x, content_w)
+            pil_fill_color = to_pil_color(fill_color)
+            pil_fill_color_semi = to_pil_color(fill_color_semi)
+
             y: float = content_y
 
             for core_idx in range(cores_count):
@@ -456,31 +463,25 @@ class CPUWidget(Widget):
                     if self.bar_border:
                         draw.rectangle(
                             (content_x, section_y, content_x + content_w - 1, section_y + section_h - 1),
-                            outline=to_pil_color(fill_color),
+                            outline=pil_fill_color,
                             fill=None
                         )
 
                     # Вычисляем точки графика для этого ядра
+                    section_bottom = section_y + section_h
                     points = []
-                    # Смещение чтобы график всегда заполнялся справа
-                    offset = self.history_length - len(self._usage_history)
-                    for i, sample in enumerate(self._usage_history):
-                        # X координата: новые данные всегда появляются справа
-                        px = content_x + int((offset + i) / max(self.history_length - 1, 1) * content_w)
+                    for px, sample in zip(xs, self._usage_history):
                         usage = sample[core_idx] if isinstance(sample, list) else 0
-                        py = section_y + section_h - int((usage / 100.0) * section_h)
-                        points.append((px, py))
+                        points.append((px, section_bottom - int((usage / 100.0) * section_h)))
 
-                    # Рисуем линию
+                    # Рисуем линию и заполнение под графиком
                     if len(points) >= 2:
-                        draw.line(points, fill=to_pil_color(fill_color), width=1)
+                        draw.line(points, fill=pil_fill_color, width=1)
 
-                    # Заполнение под графиком
-                    if len(points) >= 2:
                         fill_points = points.copy()
-                        fill_points.append((points[-1][0], section_y + section_h))
-                        fill_points.append((points[0][0], section_y + section_h))
-                        draw.polygon(fill_points, fill=to_pil_color(fill_color_semi), outline=None)
+                        fill_points.append((points[-1][0], section_bottom))
+                        fill_points.append((points[0][0], section_bottom))
+                        draw.polygon(fill_points, fill=pil_fill_color_semi, outline=None)
 
                 # Переходим к следующей секции
                 y += section_height
@@ -489,11 +490,8 @@ class CPUWidget(Widget):
         else:
             # Агрегированный график
             points = []
-            # Смещение чтобы график всегда заполнялся справа
-            offset = self.history_length - len(self._usage_history)
-            for i, sample in enumerate(self._usage_history):
-                # X координата: новые данные всегда появляются справа
-                x = content_x + int((offset + i) / max(self.history_length - 1, 1) * content_w)
+            xs = graph_x_coords(len(self._usage_history), self.history_length, content_x, content_w)
+            for x, sample in zip(xs, self._usage_history):
                 usage = sample if not isinstance(sample, list) else sum(sample) / len(sample)
                 y = content_y + content_h - int((usage / 100.0) * content_h)
                 points.append((x, y))
@@ -14,7 +14,7 @@ except ImportError:
     psutil = None
 
 from core.widget import Widget
-from utils.bitmap import Color, create_blank_image, to_pil_color
+from utils.bitmap import Color, create_blank_image, graph_x_coords, to_pil_color
 from utils.text_renderer import render_multi_line_text
 
 logger = logging.getLogger(__name__)
@@ -114,7 +114,7 @@ class DiskWidget(Widget):
         # Для вычисления скорости
         self._last_read_bytes: Optional[int] = None
         self._last_write_bytes: Optional[int] = None
-        self._last_update_time: Optional[float] = None
+        self._last_update_time: Optional[int] = None  # time.monotonic_ns()
 
         # Автоопределение максимальной скорости для динамического масштабирования
         self._peak_read_speed: float = 1.0  # MB/s
@@ -157,7 +157,9 @@ class DiskWidget(Widget):
     def update(self) -> None:
         """Обновляет данные о загрузке диска."""
         try:
-            current_time = time.time()
+            # Монотонные часы не прыгают при коррекции системного времени (NTP),
+            # целые наносекунды не теряют точность на длинных аптаймах
+            current_time = time.monotonic_ns()
             counters = self._get_disk_io_counters()
 
             if counters is None:
@@ -171,15 +173,15 @@ class DiskWidget(Widget):
 
             # Вычисляем скорость на основе изменения за интервал
             if self._last_read_bytes is not None and self._last_update_time is not None:
-                time_delta = current_time - self._last_update_time
+                time_delta_ns = current_time - self._last_update_time
 
-                if time_delta > 0:
+                if time_delta_ns > 0:
                     read_delta = current_read_bytes - self._last_read_bytes
                     write_delta = current_write_bytes - self._last_write_bytes
 
                     # Скорость в байтах/сек
-                    self._current_read_speed = max(0.0, read_delta / time_delta)
-                    self._current_write_speed = max(0.0, write_delta / time_delta)
+                    self._current_read_speed = max(0.0, read_delta * 1_000_000_000 / time_delta_ns)
+                    self._current_write_speed = max(0.0, write_delta * 1_000_000_000 / time_delta_ns)
 
                     # Обновляем пиковые значения для автомасштабирования
                     read_mbps = self._current_read_speed / (1024 * 1024)
@@ -263,26 +265,46 @@ class DiskWidget(Widget):
             kbps = bytes_per_sec / 1024
             return f"{kbps:.0f}K"
 
-    def _get_speed_percentage(self, bytes_per_sec: float, is_read: bool = True) -> float:
+    def _get_max_speed(self, is_read: bool = True) -> float:
+        """
+        Возвращает максимальную скорость для масштабирования.
+
+        Args:
+            is_read: True для чтения, False для записи
+
+        Returns:
+            Максимальная скорость в MB/s
+        """
+        if self.max_speed_mbps > 0:
+            # Фиксированное масштабирование
+            return self.max_speed_mbps
+
+        # Динамическое масштабирование
+        max_speed = self._peak_read_speed if is_read else self._peak_write_speed
+        return max(1.0, max_speed)  # Минимум 1 MB/s
+
+    def _get_speed_percentage(
+        self,
+        bytes_per_sec: float,
+        is_read: bool = True,
+        max_speed: Optional[float] = None
+    ) -> float:
         """
         Вычисляет процент от максимальной скорости.
 
         Args:
             bytes_per_sec: Скорость в байтах/сек
             is_read: True для чтения, False для записи
+            max_speed: Максимальная скорость в MB/s (None = вычислить через _get_max_speed).
+                Позволяет вычислить масштаб один раз для всей истории графика
 
         Returns:
             Процент от 0 до 100
         """
         mbps = bytes_per_sec / (1024 * 1024)
 
-        if self.max_speed_mbps > 0:
-            # Фиксированное масштабирование
-            max_speed = self.max_speed_mbps
-        else:
-            # Динамическое масштабирование
-            max_speed = self._peak_read_speed if is_read else self._peak_write_speed
-            max_speed = max(1.0, max_speed)  # Минимум 1 MB/s
+        if max_speed is None:
+            max_speed = self._get_max_speed(is_read)
 
         return min(100.0, (mbps / max_speed) * 100.0)
 
@@ -461,23 +483,27 @@ class DiskWidget(Widget):
         content_w = image.width - self.padding * 2
         content_h = image.height - self.padding * 2
 
+        read_xs = graph_x_coords(len(self._read_history), self.history_length, content_x, content_w)
+        if len(self._write_history) == len(self._read_history):
+            write_xs = read_xs
+        else:
+            write_xs = graph_x_coords(len(self._write_history), self.history_length, content_x, content_w)
+
+        # Масштаб одинаков для всех точек истории, вычисляем его один раз
+        read_max_speed = self._get_max_speed(is_read=True)
+        write_max_speed = self._get_max_speed(is_read=False)
+
         # READ график
         read_points = []
-        # Смещение чтобы график всегда заполнялся справа
-        offset = self.history_length - len(self._read_history)
-        for i, speed in enumerate(self._read_history):
-            # X координата: новые данные всегда появляются справа
-            x = content_x + int((offset + i) / max(self.history_length - 1, 1) * content_w)
-            pct = self._get_speed_percentage(speed, is_read=True)
+        for x, speed in zip(read_xs, self._read_history):
+            pct = self._get_speed_percentage(speed, max_speed=read_max_speed)
             y = content_y + content_h - int((pct / 100.0) * content_h)
             read_points.append((x, y))
 
         # WRITE график
         write_points = []
-        offset = self.history_length - len(self._write_history)
-        for i, speed in enumerate(self._write_history):
-            x = content_x + int((offset + i) / max(self.history_length - 1, 1) * content_w)
-            pct = self._get_speed_percentage(speed, is_read=False)
+        for x, speed in zip(write_xs, self._write_history):
+            pct = self._get_speed_percentage(speed, max_speed=write_max_speed)
             y = content_y + content_h - int((pct / 100.0) * content_h)
             write_points.append((x, y))
 
@@ -8,7 +8,7 @@ from typing import Optional
 from PIL import Image, ImageDraw
 
 from core.widget import Widget
-from utils.bitmap import Color, create_blank_image, load_font, to_pil_color
+from utils.bitmap import Color, create_blank_image, rasterize_text, to_pil_color
 
 logger = logging.getLogger(__name__)
 
@@ -237,27 +237,16 @@ class KeyboardWidget(Widget):
             image: PIL Image для рисования
             indicators: Список кортежей (символ, цвет)
         """
-        draw = ImageDraw.Draw(image)
-        font_obj = load_font(self.font, self.font_size)
-
         # Вычисляем доступное пространство
         content_x = self.padding
         content_y = self.padding
         content_w = image.width - self.padding * 2
         content_h = image.height - self.padding * 2
 
-        # Вычисляем размеры каждого индикатора
-        indicator_sizes = []
-        total_width = 0
-
-        for i, (symbol, _) in enumerate(indicators):
-            bbox = draw.textbbox((0, 0), symbol, font=font_obj)
-            width = bbox[2] - bbox[0]
-            height = bbox[3] - bbox[1]
-            indicator_sizes.append((width, height))
-            total_width += width
-            if i < len(indicators) - 1:
-                total_width += self.spacing
+        # Растеризуем индикаторы: набор символов виджета фиксирован, поэтому маски
+        # берутся из кэша rasterize_text, размер маски равен размеру символа
+        rasterized = [rasterize_text(symbol, self.font, self.font_size) for symbol, _ in indicators]
+        total_width = sum(mask.width for mask, _ in rasterized) + self.spacing * (len(indicators) - 1)
 
         # Вычисляем начальную X координату в зависимости от выравнивания
         if self.horizontal_align == "left":
@@ -268,7 +257,9 @@ class KeyboardWidget(Widget):
             current_x = content_x + (content_w - total_width) // 2
 
         # Рендерим каждый индикатор
-        for (symbol, color), (width, height) in zip(indicators, indicator_sizes):
+        for (_, color), (mask, (offset_x, offset_y)) in zip(indicators, rasterized):
+            width, height = mask.size
+
             # Вычисляем Y координату в зависимости от вертикального выравнивания
             if self.vertical_align == "top":
                 y = content_y
@@ -279,7 +270,7 @@ class KeyboardWidget(Widget):
 
             # Текст всегда непрозрачный (полная видимость)
             text_color: Color = (color, 255) if image.mode == 'LA' else color
-            draw.text((current_x, y), symbol, fill=to_pil_color(text_color), font=font_obj)
+            image.paste(text_color, (current_x + offset_x, y + offset_y), mask)
 
             # Сдвигаем X координату для следующего индикатора
             current_x += width + self.spacing
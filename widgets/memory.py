@@ -13,7 +13,7 @@ except ImportError:
     psutil = None
 
 from core.widget import Widget
-from utils.bitmap import Color, create_blank_image, to_pil_color
+from utils.bitmap import Color, create_blank_image, graph_x_coords, to_pil_color
 from utils.text_renderer import render_single_line_text
 
 logger = logging.getLogger(__name__)
@@ -278,11 +278,8 @@ class MemoryWidget(Widget):
 
         # График истории
         points = []
-        # Смещение чтобы график всегда заполнялся справа
-        offset = self.history_length - len(self._usage_history)
-        for i, sample in enumerate(self._usage_history):
-            # X координата: новые данные всегда появляются справа
-            x = content_x + int((offset + i) / max(self.history_length - 1, 1) * content_w)
+        xs = graph_x_coords(len(self._usage_history), self.history_length, content_x, content_w)
+        for x, sample in zip(xs, self._usage_history):
             y = content_y + content_h - int((sample / 100.0) * content_h)
             points.append((x, y))
 
@@ -3,6 +3,7 @@ Network Widget - отображает скорость сети (RX/TX) в ра
 """
 
 import logging
+import time
 from typing import Optional
 from collections import deque
 from PIL import Image, ImageDraw
@@ -13,7 +14,7 @@ except ImportError:
     psutil = None
 
 from core.widget import Widget
-from utils.bitmap import Color, create_blank_image, to_pil_color
+from utils.bitmap import Color, create_blank_image, graph_x_coords, to_pil_color
 from utils.text_renderer import render_multi_line_text
 
 logger = logging.getLogger(__name__)
@@ -115,7 +116,7 @@ class NetworkWidget(Widget):
         # Предыдущие значения счётчиков для вычисления дельты
         self._prev_rx_bytes: Optional[int] = None
         self._prev_tx_bytes: Optional[int] = None
-        self._prev_time: Optional[float] = None
+        self._prev_time: Optional[int] = None  # time.monotonic_ns()
 
         # История для graph режима (очереди кортежей (rx_speed, tx_speed))
         self._rx_history: deque[float] = deque(maxlen=history_length)
@@ -133,8 +134,6 @@ class NetworkWidget(Widget):
     def update(self) -> None:
         """Обновляет данные о скорости сети."""
         try:
-            import time
-
             # Получаем статистику по всем интерфейсам
             net_io = psutil.net_io_counters(pernic=True)
 
@@ -148,18 +147,20 @@ class NetworkWidget(Widget):
                 return
 
             stats = net_io[self.interface]
-            current_time = time.time()
+            # Монотонные часы не прыгают при коррекции системного времени (NTP)
+            current_time = time.monotonic_ns()
 
             # Вычисляем скорость на основе дельты
             if self._prev_rx_bytes is not None and self._prev_tx_bytes is not None and self._prev_time is not None:
-                time_delta = current_time - self._prev_time
-                if time_delta > 0:
+                time_delta_ns = current_time - self._prev_time
+                if time_delta_ns > 0:
                     rx_delta = stats.bytes_recv - self._prev_rx_bytes
                     tx_delta = stats.bytes_sent - self._prev_tx_bytes
 
-                    # Скорость в байтах/сек
-                    self._current_rx_speed = max(0.0, rx_delta / time_delta)
-                    self._current_tx_speed = max(0.0, tx_delta / time_delta)
+                    # Скорость в байтах/сек: интервал общий для RX и TX, делим один раз
+                    per_second = 1_000_000_000 / time_delta_ns
+                    self._current_rx_speed = max(0.0, rx_delta * per_second)
+                    self._current_tx_speed = max(0.0, tx_delta * per_second)
                 else:
                     self._current_rx_speed = 0.0
                     self._current_tx_speed = 0.0
@@ -237,17 +238,39 @@ class NetworkWidget(Widget):
 
         return image
 
-    def _get_speed_percentage(self, speed_bytes: float) -> float:
-        """Вычисляет процент от максимальной скорости."""
+    def _get_max_speed(self) -> float:
+        """
+        Возвращает максимальную скорость для масштабирования.
+
+        Returns:
+            Максимальная скорость в байтах/сек
+        """
         if self.dynamic_scaling:
             # Динамическое масштабирование: находим максимум в истории
             max_rx = max(self._rx_history) if len(self._rx_history) > 0 else 1.0
             max_tx = max(self._tx_history) if len(self._tx_history) > 0 else 1.0
-            max_speed = max(max_rx, max_tx, 1.0)  # Минимум 1 байт для избежания деления на 0
-            return min(100.0, (speed_bytes / max_speed) * 100.0)
-        else:
-            # Фиксированное масштабирование
-            return min(100.0, (speed_bytes / self.max_speed_bytes) * 100.0)
+            return max(max_rx, max_tx, 1.0)  # Минимум 1 байт для избежания деления на 0
+
+        # Фиксированное масштабирование
+        return self.max_speed_bytes
+
+    def _get_speed_percentage(self, speed_bytes: float, max_speed: Optional[float] = None) -> float:
+        """
+        Вычисляет процент от максимальной скорости.
+
+        Args:
+            speed_bytes: Скорость в байтах/сек
+            max_speed: Максимальная скорость в байтах/сек (None = вычислить через _get_max_speed).
+                При динамическом масштабировании вычисление проходит по всей истории,
+                поэтому график вычисляет масштаб один раз и передаёт его для каждой точки
+
+        Returns:
+            Процент от 0 до 100
+        """
+        if max_speed is None:
+            max_speed = self._get_max_speed()
+
+        return min(100.0, (speed_bytes / max_speed) * 100.0)
 
     def _format_speed(self, speed_bytes: float) -> str:
         """Форматирует скорость в соответствии с выбранной единицей измерения."""
@@ -440,9 +463,11 @@ class NetworkWidget(Widget):
             logger.debug(f"Not enough history for graph: rx={len(self._rx_history)}, tx={len(self._tx_history)}, need 2+")
             return
 
-        logger.debug(f"Rendering graph: {len(self._rx_history)} samples, "
-                     f"RX range {min(self._rx_history)/1024:.1f}-{max(self._rx_history)/1024:.1f}KB/s, "
-                     f"TX range {min(self._tx_history)/1024:.1f}-{max(self._tx_history)/1024:.1f}KB/s")
+        # min/max по истории нужны только для отладочного сообщения
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Rendering graph: {len(self._rx_history)} samples, "
+                         f"RX range {min(self._rx_history)/1024:.1f}-{max(self._rx_history)/1024:.1f}KB/s, "
+                         f"TX range {min(self._tx_history)/1024:.1f}-{max(self._tx_history)/1024:.1f}KB/s")
 
         draw = ImageDraw.Draw(image)
 
@@ -458,14 +483,19 @@ class NetworkWidget(Widget):
         content_w = image.width - self.padding * 2
         content_h = image.height - self.padding * 2
 
+        rx_xs = graph_x_coords(len(self._rx_history), self.history_length, content_x, content_w)
+        if len(self._tx_history) == len(self._rx_history):
+            tx_xs = rx_xs
+        else:
+            tx_xs = graph_x_coords(len(self._tx_history), self.history_length, content_x, content_w)
+
+        # Масштаб одинаков для всех точек обоих графиков, вычисляем его один раз
+        max_speed = self._get_max_speed()
+
         # RX график (первым, чтобы быть под TX)
         rx_points = []
-        # Смещение чтобы график всегда заполнялся справа
-        offset = self.history_length - len(self._rx_history)
-        for i, speed in enumerate(self._rx_history):
-            # X координата: новые данные всегда появляются справа
-            x = content_x + int((offset + i) / max(self.history_length - 1, 1) * content_w)
-            pct = self._get_speed_percentage(speed)
+        for x, speed in zip(rx_xs, self._rx_history):
+            pct = self._get_speed_percentage(speed, max_speed=max_speed)
             y = content_y + content_h - int((pct / 100.0) * content_h)
             rx_points.append((x, y))
 
@@ -485,12 +515,8 @@ class NetworkWidget(Widget):
 
         # TX график (поверх)
         tx_points = []
-        # Смещение чтобы график всегда заполнялся справа
-        offset = self.history_length - len(self._tx_history)
-        for i, speed in enumerate(self._tx_history):
-            # X координата: новые данные всегда появляются справа
-            x = content_x + int((offset + i) / max(self.history_length - 1, 1) * content_w)
-            pct = self._get_speed_percentage(speed)
+        for x, speed in zip(tx_xs, self._tx_history):
+            pct = self._get_speed_percentage(speed, max_speed=max_speed)
             y = content_y + content_h - int((pct / 100.0) * content_h)
             tx_points.append((x, y))
 